@@ -0,0 +1,128 @@
+import argparse
+import glob
+import json
+import os
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from benchmarks.corpus import CorpusConfig, generate_to_size, parse_size
+from benchmarks.differential import run_harness, format_report
+from benchmarks.printing import run_print_benchmark, format_print_benchmark
+from benchmarks.bench import (DEFAULT_SIZES, run_benchmarks, compare_results,
+                              format_results, format_regressions,
+                              compare_parsers, format_parser_comparison)
+
+PROGRAMS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "programs")
+
+
+def _add_corpus_options(parser):
+    parser.add_argument("--functions", type=int, default=10, help="Functions per generated unit")
+    parser.add_argument("--depth", type=int, default=2, help="Nesting depth of if/while blocks")
+    parser.add_argument("--expr-length", type=int, default=4, help="Operands per expression")
+    parser.add_argument("--array-size", type=int, default=8, help="Length of generated arrays")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed for the generator")
+
+
+def _config_from(args):
+    return CorpusConfig(args.functions, args.depth, args.expr_length, args.array_size, args.seed)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="CodeConverter benchmarks")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="Benchmark the pipeline and write JSON results")
+    run.add_argument("--sizes", default=','.join(DEFAULT_SIZES), help="Comma-separated sizes, e.g. 1KB,1MB,100MB")
+    run.add_argument("--langs", default="c,python", help="Comma-separated input languages")
+    run.add_argument("--repeat", type=int, default=3, help="Timed runs per input (best is kept)")
+    run.add_argument("--output", help="Write results JSON here (e.g. a baseline file)")
+    run.add_argument("--c-parser", choices=["fast", "pycparser"], default="fast", help="C parser to benchmark")
+    _add_corpus_options(run)
+
+    compare = commands.add_parser("compare", help="Flag regressions between two result files")
+    compare.add_argument("baseline", help="Baseline results JSON")
+    compare.add_argument("current", help="Current results JSON")
+    compare.add_argument("--threshold", type=float, default=0.10, help="Allowed slowdown ratio (0.10 = 10%%)")
+
+    generate = commands.add_parser("generate", help="Write a synthetic source file")
+    generate.add_argument("lang", choices=["c", "python"])
+    generate.add_argument("size", help="Approximate size, e.g. 64KB")
+    generate.add_argument("--output", required=True, help="Output file")
+    _add_corpus_options(generate)
+
+    diff = commands.add_parser("diff", help="Run C programs and their conversions and compare output")
+    diff.add_argument("programs", nargs="*", help="C programs (defaults to benchmarks/programs/*.c)")
+    diff.add_argument("--repeat", type=int, default=3, help="Timed runs per executable (best is kept)")
+    diff.add_argument("--timeout", type=float, default=30, help="Seconds before a run is abandoned")
+    diff.add_argument("--slow-ratio", type=float, default=200.0, help="Python/C runtime ratio reported as slow")
+    diff.add_argument("--output", help="Write the report JSON here")
+
+    parsers = commands.add_parser("parsers", help="Compare the fast C parser with pycparser")
+    parsers.add_argument("files", nargs="*", help="C files (defaults to benchmarks/programs/*.c plus the synthetic corpus)")
+    parsers.add_argument("--sizes", default="10KB,100KB,1MB", help="Sizes of synthetic C inputs to add")
+    parsers.add_argument("--repeat", type=int, default=3, help="Timed runs per input (best is kept)")
+    parsers.add_argument("--output", help="Write the comparison JSON here")
+    _add_corpus_options(parsers)
+
+    printing = commands.add_parser("printing", help="Time print-heavy converted C with and without buffered stdout")
+    printing.add_argument("--lines", type=int, default=20000, help="Lines each program prints")
+    printing.add_argument("--repeat", type=int, default=3, help="Timed runs per executable (best is kept)")
+    printing.add_argument("--output", help="Write the results JSON here")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        data = run_benchmarks(args.sizes.split(','), args.langs.split(','), args.repeat,
+                              _config_from(args), log=print, c_parser=args.c_parser)
+        print(format_results(data))
+        if args.output:
+            with open(args.output, "w") as f:
+                json.dump(data, f, indent=2)
+            print(f"Results written to {args.output}")
+        return 0
+    if args.command == "compare":
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        with open(args.current) as f:
+            current = json.load(f)
+        regressions = compare_results(baseline, current, args.threshold)
+        print(format_regressions(regressions))
+        return 1 if regressions else 0
+    if args.command == "parsers":
+        sources = {}
+        for path in args.files or sorted(glob.glob(os.path.join(PROGRAMS_DIR, "*.c"))):
+            with open(path) as f:
+                sources[os.path.basename(path)] = f.read()
+        if not args.files:
+            for label in args.sizes.split(','):
+                sources[f"synthetic {label}"] = generate_to_size('c', parse_size(label), _config_from(args))
+        data = compare_parsers(sources, args.repeat)
+        print(format_parser_comparison(data))
+        if args.output:
+            with open(args.output, "w") as f:
+                json.dump(data, f, indent=2)
+            print(f"Results written to {args.output}")
+        return 1 if data['mismatches'] else 0
+    if args.command == "printing":
+        data = run_print_benchmark(args.lines, args.repeat)
+        print(format_print_benchmark(data))
+        if args.output:
+            with open(args.output, "w") as f:
+                json.dump(data, f, indent=2)
+            print(f"Results written to {args.output}")
+        return 0 if all(row['same_output'] for row in data['results']) else 1
+    if args.command == "diff":
+        report = run_harness(args.programs or None, args.repeat, args.timeout, args.slow_ratio)
+        print(format_report(report))
+        if args.output:
+            with open(args.output, "w") as f:
+                json.dump(report, f, indent=2)
+            print(f"Report written to {args.output}")
+        return 0 if set(report['summary']) <= {'ok', 'slow'} else 1
+    # generate
+    with open(args.output, "w") as f:
+        f.write(generate_to_size(args.lang, parse_size(args.size), _config_from(args)))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
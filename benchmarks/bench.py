@@ -0,0 +1,205 @@
+"""Time and measure each pipeline stage over a synthetic corpus"""
+import math
+import platform
+import time
+from parser.c_parser import CParser
+from parser.fast_c_parser import FastCParser, UnsupportedSyntax
+from converter.ast_transformer import ASTTransformer
+from converter.ir_diff import diff_ir
+from converter.profiling import Profiler
+from converter.pipeline import parse_source, generate_output
+from .corpus import CorpusConfig, generate_to_size, parse_size
+
+DEFAULT_SIZES = ['1KB', '10KB', '100KB', '1MB']
+RESULTS_VERSION = 1
+
+
+def _target_for(lang):
+    return 'python' if lang == 'c' else 'c'
+
+
+def _profile_once(source, lang, trace_memory, c_parser):
+    profiler = Profiler(trace_memory=trace_memory)
+    ast = parse_source(source, lang, profiler, c_parser=c_parser)
+    generate_output(ast, _target_for(lang), profiler)
+    return profiler.stages
+
+
+def benchmark_source(source, lang, repeat=3, c_parser='fast'):
+    """Return per-stage timings (best of `repeat`) and peak memory for one input"""
+    stages = {}
+    # Timed runs skip tracemalloc, which would otherwise dominate the timings
+    for _ in range(repeat):
+        for stage in _profile_once(source, lang, False, c_parser):
+            entry = stages.setdefault(stage.name, {'wall_time': math.inf, 'cpu_time': math.inf})
+            entry['wall_time'] = min(entry['wall_time'], stage.wall_time)
+            entry['cpu_time'] = min(entry['cpu_time'], stage.cpu_time)
+    for stage in _profile_once(source, lang, True, c_parser):
+        stages[stage.name]['peak_memory'] = stage.peak_memory
+        stages[stage.name]['nodes'] = stage.total_nodes
+    return stages
+
+
+def run_benchmarks(sizes=None, langs=('c', 'python'), repeat=3, config=None, log=None, c_parser='fast'):
+    """Benchmark every language at every size and return a JSON-ready dict"""
+    sizes = sizes or DEFAULT_SIZES
+    config = config or CorpusConfig()
+    results = []
+    for lang in langs:
+        for label in sizes:
+            source = generate_to_size(lang, parse_size(label), config)
+            stages = benchmark_source(source, lang, repeat, c_parser)
+            results.append({
+                'lang': lang,
+                'target': _target_for(lang),
+                'size': label,
+                'bytes': len(source.encode()),
+                'stages': stages,
+                'total_time': sum(s['wall_time'] for s in stages.values()),
+            })
+            if log:
+                log(f"{lang:<7}{label:>7}  {results[-1]['total_time'] * 1000:10.2f} ms")
+    return {
+        'version': RESULTS_VERSION,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'config': vars(config),
+        'c_parser': c_parser,
+        'results': results,
+        'scaling': scaling_exponents(results),
+    }
+
+
+def scaling_exponents(results):
+    """Fit time ~ bytes**k per language and stage; k near 1 means linear scaling"""
+    exponents = {}
+    for lang in sorted({r['lang'] for r in results}):
+        rows = [r for r in results if r['lang'] == lang]
+        if len(rows) < 2:
+            continue
+        for stage in rows[0]['stages']:
+            points = [(math.log(r['bytes']), math.log(r['stages'][stage]['wall_time']))
+                      for r in rows if r['stages'][stage]['wall_time'] > 0]
+            if len(points) < 2:
+                continue
+            mean_x = sum(x for x, _ in points) / len(points)
+            mean_y = sum(y for _, y in points) / len(points)
+            var_x = sum((x - mean_x) ** 2 for x, _ in points)
+            if var_x == 0:
+                continue
+            slope = sum((x - mean_x) * (y - mean_y) for x, y in points) / var_x
+            exponents.setdefault(lang, {})[stage] = round(slope, 3)
+    return exponents
+
+
+def compare_results(baseline, current, threshold=0.10, noise=0.0005):
+    """List stage regressions where current exceeds baseline by more than `threshold`.
+
+    Time differences smaller than `noise` seconds are ignored so that
+    microsecond-scale stages don't flap.
+    """
+    regressions = []
+    baseline_rows = {(r['lang'], r['size']): r for r in baseline['results']}
+    for row in current['results']:
+        base = baseline_rows.get((row['lang'], row['size']))
+        if not base:
+            continue
+        for stage, measured in row['stages'].items():
+            expected = base['stages'].get(stage)
+            if not expected:
+                continue
+            for metric, slack in (('wall_time', noise), ('peak_memory', 0)):
+                if metric not in measured or metric not in expected:
+                    continue
+                old, new = expected[metric], measured[metric]
+                if new > old * (1 + threshold) and new - old > slack:
+                    regressions.append({
+                        'lang': row['lang'],
+                        'size': row['size'],
+                        'stage': stage,
+                        'metric': metric,
+                        'baseline': old,
+                        'current': new,
+                        'ratio': new / old if old else math.inf,
+                    })
+    return regressions
+
+
+def _best_time(func, repeat):
+    best = math.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def compare_parsers(sources, repeat=3):
+    """Time the fast C parser against pycparser + ASTTransformer.
+
+    `sources` maps a label to C source. Inputs outside the fast parser's
+    subset count towards the fallback rate; for the rest the two IRs must
+    match. Returns a JSON-ready dict.
+    """
+    c_parser, fast_parser = CParser(), FastCParser()
+    rows = []
+    for label, source in sources.items():
+        slow_time, slow_ast = _best_time(lambda: ASTTransformer().transform(c_parser.parse(source)), repeat)
+        row = {'input': label, 'bytes': len(source.encode()), 'pycparser_time': slow_time}
+        try:
+            fast_time, fast_ast = _best_time(lambda: fast_parser.parse(source), repeat)
+        except UnsupportedSyntax as e:
+            row.update(fallback=True, reason=str(e))
+        else:
+            row.update(fallback=False, fast_time=fast_time,
+                       speedup=slow_time / fast_time if fast_time else math.inf,
+                       differences=diff_ir(slow_ast, fast_ast))
+        rows.append(row)
+    fast_rows = [r for r in rows if not r['fallback']]
+    slow_total = sum(r['pycparser_time'] for r in fast_rows)
+    fast_total = sum(r['fast_time'] for r in fast_rows)
+    return {
+        'results': rows,
+        'fallback_rate': (len(rows) - len(fast_rows)) / len(rows) if rows else 0.0,
+        'speedup': slow_total / fast_total if fast_total else None,
+        'mismatches': [r['input'] for r in fast_rows if r['differences']],
+    }
+
+
+def format_parser_comparison(data):
+    lines = [f"{'input':<28}{'bytes':>10}{'pycparser ms':>14}{'fast ms':>10}{'speedup':>9}"]
+    for row in data['results']:
+        if row['fallback']:
+            tail = f"{'fallback':>19}  ({row['reason']})"
+        else:
+            tail = f"{row['fast_time'] * 1000:>10.2f}{row['speedup']:>8.1f}x"
+        lines.append(f"{row['input'][:27]:<28}{row['bytes']:>10}{row['pycparser_time'] * 1000:>14.2f}{tail}")
+    if data['speedup'] is not None:
+        lines.append(f"overall speedup on fast-path inputs: {data['speedup']:.1f}x")
+    lines.append(f"fallback rate: {data['fallback_rate']:.0%}")
+    for label in data['mismatches']:
+        lines.append(f"IR MISMATCH {label}")
+    return '\n'.join(lines)
+
+
+def format_results(data):
+    lines = [f"{'lang':<8}{'size':>7}{'bytes':>12}{'stage':>11}{'wall ms':>11}{'peak KiB':>11}"]
+    for row in data['results']:
+        for stage, m in row['stages'].items():
+            lines.append(f"{row['lang']:<8}{row['size']:>7}{row['bytes']:>12}{stage:>11}"
+                         f"{m['wall_time'] * 1000:>11.2f}{m.get('peak_memory', 0) / 1024:>11.1f}")
+    for lang, stages in data.get('scaling', {}).items():
+        fitted = ', '.join(f"{stage}={k}" for stage, k in stages.items())
+        lines.append(f"scaling exponent ({lang}): {fitted}")
+    return '\n'.join(lines)
+
+
+def format_regressions(regressions):
+    if not regressions:
+        return "No regressions."
+    lines = []
+    for r in regressions:
+        lines.append(f"REGRESSION {r['lang']} {r['size']} {r['stage']} {r['metric']}: "
+                     f"{r['baseline']:.6g} -> {r['current']:.6g} ({r['ratio']:.2f}x)")
+    return '\n'.join(lines)
+
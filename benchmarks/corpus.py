@@ -0,0 +1,125 @@
+"""Synthetic C and Python source generator for benchmarks"""
+import random
+
+_OPERATORS = ['+', '-', '*']
+
+
+class CorpusConfig:
+    """Shape of the generated source"""
+
+    def __init__(self, function_count=10, nesting_depth=2, expression_length=4, array_size=8, seed=0):
+        self.function_count = function_count
+        self.nesting_depth = nesting_depth
+        self.expression_length = expression_length
+        self.array_size = array_size
+        self.seed = seed
+
+    def copy(self, **changes):
+        config = CorpusConfig(self.function_count, self.nesting_depth,
+                              self.expression_length, self.array_size, self.seed)
+        for name, value in changes.items():
+            setattr(config, name, value)
+        return config
+
+
+def _expression(rng, length):
+    """Build an operator chain like 'a + 3 * b - x' with `length` operands"""
+    operands = ['a', 'b', 'x']
+    parts = [rng.choice(operands)]
+    for _ in range(length - 1):
+        parts.append(rng.choice(_OPERATORS))
+        parts.append(rng.choice(operands + [str(rng.randint(1, 9))]))
+    return ' '.join(parts)
+
+
+def _c_block(rng, config, depth, indent):
+    ind = '    ' * indent
+    if depth == 0:
+        return [f"{ind}x = {_expression(rng, config.expression_length)};"]
+    lines = []
+    if depth % 2:
+        lines.append(f"{ind}if (x > {rng.randint(1, 50)}) {{")
+        lines.extend(_c_block(rng, config, depth - 1, indent + 1))
+        lines.append(f"{ind}}} else {{")
+        lines.extend(_c_block(rng, config, depth - 1, indent + 1))
+        lines.append(f"{ind}}}")
+    else:
+        lines.append(f"{ind}while (x < {rng.randint(50, 100)}) {{")
+        lines.extend(_c_block(rng, config, depth - 1, indent + 1))
+        lines.append(f"{ind}    x = x + 1;")
+        lines.append(f"{ind}}}")
+    return lines
+
+
+def _python_block(rng, config, depth, indent):
+    ind = '    ' * indent
+    if depth == 0:
+        return [f"{ind}x = {_expression(rng, config.expression_length)}"]
+    lines = []
+    if depth % 2:
+        lines.append(f"{ind}if x > {rng.randint(1, 50)}:")
+        lines.extend(_python_block(rng, config, depth - 1, indent + 1))
+        lines.append(f"{ind}else:")
+        lines.extend(_python_block(rng, config, depth - 1, indent + 1))
+    else:
+        lines.append(f"{ind}while x < {rng.randint(50, 100)}:")
+        lines.extend(_python_block(rng, config, depth - 1, indent + 1))
+        lines.append(f"{ind}    x = x + 1")
+    return lines
+
+
+def _c_function(rng, config, index):
+    lines = [f"int func_{index}(int a, int b) {{",
+             f"    int arr_{index}[{config.array_size}];",
+             f"    int x = {_expression(rng, config.expression_length)};",
+             f"    arr_{index}[0] = x;"]
+    lines.extend(_c_block(rng, config, config.nesting_depth, 1))
+    lines.append(f'    printf("%d", arr_{index}[0]);')
+    lines.append("    return x;")
+    lines.append("}")
+    return '\n'.join(lines) + '\n'
+
+
+def _python_function(rng, config, index):
+    values = ', '.join(str(rng.randint(0, 99)) for _ in range(config.array_size))
+    lines = [f"def func_{index}(a, b):",
+             f"    arr_{index} = [{values}]",
+             f"    x = {_expression(rng, config.expression_length)}",
+             f"    arr_{index}[0] = x"]
+    lines.extend(_python_block(rng, config, config.nesting_depth, 1))
+    lines.append(f"    print(arr_{index}[0])")
+    lines.append("    return x")
+    return '\n'.join(lines) + '\n'
+
+
+def generate_source(lang, config):
+    """Generate a C or Python program shaped by `config`"""
+    if lang == 'c':
+        make_function = _c_function
+        main = "int main() {\n    int r = func_0(1, 2);\n    return 0;\n}\n"
+    elif lang == 'python':
+        make_function = _python_function
+        main = "def main():\n    r = func_0(1, 2)\n    return 0\n"
+    else:
+        raise ValueError(f"Unsupported corpus language: {lang}")
+    rng = random.Random(config.seed)
+    functions = [make_function(rng, config, i) for i in range(config.function_count)]
+    return '\n'.join(functions) + '\n' + main
+
+
+def generate_to_size(lang, target_bytes, config=None):
+    """Generate source of roughly `target_bytes` by scaling the function count"""
+    config = config or CorpusConfig()
+    sample = generate_source(lang, config.copy(function_count=8))
+    per_function = max(1, len(sample) // 8)
+    count = max(1, target_bytes // per_function)
+    return generate_source(lang, config.copy(function_count=count))
+
+
+def parse_size(text):
+    """Parse sizes like '1KB', '10MB' or '4096' into a byte count"""
+    text = text.strip().upper()
+    for suffix, factor in (('KB', 1024), ('MB', 1024 ** 2), ('GB', 1024 ** 3), ('B', 1)):
+        if text.endswith(suffix):
+            return int(float(text[:-len(suffix)]) * factor)
+    return int(text)
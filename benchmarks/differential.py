@@ -0,0 +1,168 @@
+"""Differential execution of converted programs.
+
+Each C program in the corpus is compiled and run as-is, converted to Python
+and run, and (when the Python output parses back) converted to C again and
+compiled. Stdout is compared against the original and runtimes are recorded
+so incorrect or pathologically slow conversions show up in the report.
+Runtimes are wall-clock per process, so they include interpreter startup.
+"""
+import glob
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from converter.pipeline import parse_source, generate_output
+
+PROGRAMS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'programs')
+
+# Converted programs define main() but never call it
+PYTHON_DRIVER = '\n\nif __name__ == "__main__":\n    main()\n'
+
+# The supported C subset has no preprocessor, so stdio.h is force-included
+C_FLAGS = ['-O2', '-w', '-include', 'stdio.h']
+
+
+def find_compiler():
+    """Return the path of the local C compiler ($CC or cc), or None"""
+    return shutil.which(os.environ.get('CC', 'cc'))
+
+
+def corpus_programs(directory=PROGRAMS_DIR):
+    return sorted(glob.glob(os.path.join(directory, '*.c')))
+
+
+def _compile(cc, source_path, binary_path, timeout):
+    proc = subprocess.run([cc, *C_FLAGS, source_path, '-o', binary_path],
+                          capture_output=True, text=True, timeout=timeout)
+    return proc.returncode == 0, proc.stderr.strip()
+
+
+def _run(argv, repeat, timeout):
+    """Run argv `repeat` times; return (returncode, stdout, stderr, best seconds)"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        proc = subprocess.run(argv, capture_output=True, text=True, timeout=timeout)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return proc.returncode, proc.stdout, proc.stderr.strip(), best
+
+
+def check_program(path, cc, workdir, repeat=3, timeout=30, slow_ratio=200.0):
+    """Run one C program through the differential checks and return its record"""
+    name = os.path.splitext(os.path.basename(path))[0]
+    record = {'program': name, 'status': 'ok'}
+    with open(path) as f:
+        c_code = f.read()
+
+    binary = os.path.join(workdir, name)
+    try:
+        ok, error = _compile(cc, path, binary, timeout)
+    except subprocess.TimeoutExpired:
+        record.update(status='original_compile_timeout')
+        return record
+    if not ok:
+        record.update(status='original_compile_error', error=error)
+        return record
+    try:
+        returncode, expected, stderr, c_time = _run([binary], repeat, timeout)
+    except subprocess.TimeoutExpired:
+        record.update(status='original_timeout')
+        return record
+    record['c_time'] = c_time
+    if returncode != 0:
+        record.update(status='original_error', returncode=returncode,
+                      error=stderr.splitlines()[-1] if stderr else '')
+        return record
+
+    try:
+        py_code = generate_output(parse_source(c_code, 'c'), 'python')
+    except Exception as e:
+        record.update(status='convert_error', error=f"{type(e).__name__}: {e}")
+        return record
+    py_path = os.path.join(workdir, name + '.py')
+    with open(py_path, 'w') as f:
+        f.write(py_code + PYTHON_DRIVER)
+    try:
+        returncode, actual, stderr, py_time = _run([sys.executable, py_path], repeat, timeout)
+    except subprocess.TimeoutExpired:
+        record.update(status='python_timeout')
+        return record
+    record['python_time'] = py_time
+    record['ratio'] = py_time / c_time if c_time else None
+    if returncode != 0:
+        record.update(status='python_error', error=stderr.splitlines()[-1] if stderr else '')
+    elif actual != expected:
+        record.update(status='mismatch', expected=expected, actual=actual)
+    elif record['ratio'] and record['ratio'] > slow_ratio:
+        record['status'] = 'slow'
+
+    record['roundtrip_c'] = _check_roundtrip(name, py_code, expected, cc, workdir, repeat, timeout)
+    return record
+
+
+def _check_roundtrip(name, py_code, expected, cc, workdir, repeat, timeout):
+    """Convert the Python output back to C, compile it and compare stdout"""
+    try:
+        c_code = generate_output(parse_source(py_code, 'python'), 'c')
+    except Exception as e:
+        return {'status': 'convert_error', 'error': f"{type(e).__name__}: {e}"}
+    c_path = os.path.join(workdir, name + '_roundtrip.c')
+    with open(c_path, 'w') as f:
+        f.write(c_code + '\n')
+    binary = os.path.join(workdir, name + '_roundtrip')
+    try:
+        ok, error = _compile(cc, c_path, binary, timeout)
+    except subprocess.TimeoutExpired:
+        return {'status': 'compile_timeout'}
+    if not ok:
+        return {'status': 'compile_error', 'error': _first_error(error)}
+    try:
+        returncode, actual, _, elapsed = _run([binary], repeat, timeout)
+    except subprocess.TimeoutExpired:
+        return {'status': 'timeout'}
+    if returncode != 0:
+        return {'status': 'runtime_error', 'returncode': returncode, 'actual': actual}
+    if actual != expected:
+        return {'status': 'mismatch', 'expected': expected, 'actual': actual, 'time': elapsed}
+    return {'status': 'ok', 'time': elapsed}
+
+
+def _first_error(compiler_output):
+    for line in compiler_output.splitlines():
+        if 'error' in line:
+            return line
+    return compiler_output.splitlines()[0] if compiler_output else ''
+
+
+def run_harness(paths=None, repeat=3, timeout=30, slow_ratio=200.0, cc=None):
+    """Check every program and return a JSON-ready report"""
+    cc = cc or find_compiler()
+    if not cc:
+        raise RuntimeError("No C compiler found; set $CC or install cc")
+    paths = paths or corpus_programs()
+    with tempfile.TemporaryDirectory() as workdir:
+        records = [check_program(p, cc, workdir, repeat, timeout, slow_ratio) for p in paths]
+    summary = {}
+    for record in records:
+        summary[record['status']] = summary.get(record['status'], 0) + 1
+    return {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'compiler': cc,
+        'programs': records,
+        'summary': summary,
+    }
+
+
+def format_report(report):
+    lines = [f"{'program':<14}{'status':<16}{'c ms':>9}{'py ms':>9}{'ratio':>8}  roundtrip C"]
+    for r in report['programs']:
+        c_ms = f"{r['c_time'] * 1000:.1f}" if 'c_time' in r else '-'
+        py_ms = f"{r['python_time'] * 1000:.1f}" if 'python_time' in r else '-'
+        ratio = f"{r['ratio']:.1f}x" if r.get('ratio') else '-'
+        roundtrip = r.get('roundtrip_c', {}).get('status', '-')
+        lines.append(f"{r['program']:<14}{r['status']:<16}{c_ms:>9}{py_ms:>9}{ratio:>8}  {roundtrip}")
+    lines.append('summary: ' + ', '.join(f"{k}={v}" for k, v in sorted(report['summary'].items())))
+    return '\n'.join(lines)
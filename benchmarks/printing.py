@@ -0,0 +1,140 @@
+"""Time print-heavy Python programs converted to C, with and without stdout buffering.
+
+Each program is converted twice: as before (default stdio buffering, which
+flushes every line when stdout is a terminal) and with the block-buffered
+stdout that generate_c now emits for prints inside loops. Both binaries
+run with stdout on a pipe and, where available, on a pseudo-terminal.
+"""
+import os
+import subprocess
+import tempfile
+import time
+from converter.pipeline import parse_source, generate_output
+from .differential import find_compiler
+
+PRINT_PROGRAMS = {
+    'ints': '''
+def main():
+    i = 0
+    while i < {lines}:
+        print(i)
+        i = i + 1
+    return 0
+''',
+    'doubles': '''
+def main():
+    x = 0.5
+    i = 0
+    while i < {lines}:
+        print(x * i)
+        i = i + 1
+    return 0
+''',
+    'list': '''
+def main():
+    xs = []
+    i = 0
+    while i < {lines}:
+        xs.append(i * 3)
+        i = i + 1
+    j = 0
+    while j < len(xs):
+        print(xs[j])
+        j = j + 1
+    print("done")
+    return 0
+''',
+}
+
+
+def _terminal_available():
+    try:
+        import pty
+        master, slave = pty.openpty()
+    except (ImportError, OSError):
+        return False
+    os.close(master)
+    os.close(slave)
+    return True
+
+
+def _run(binary, terminal, timeout):
+    """Run binary with stdout on a pseudo-terminal or a pipe; returns (seconds, output)"""
+    start = time.perf_counter()
+    if not terminal:
+        result = subprocess.run([binary], stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, timeout=timeout)
+        return time.perf_counter() - start, result.stdout
+    import pty
+    master, slave = pty.openpty()
+    try:
+        proc = subprocess.Popen([binary], stdout=slave, stderr=subprocess.DEVNULL)
+        os.close(slave)
+        slave = None
+        chunks = []
+        while True:
+            try:
+                chunk = os.read(master, 1 << 16)
+            except OSError:  # EIO once the child has exited and closed the terminal
+                break
+            if not chunk:
+                break
+            chunks.append(chunk)
+        proc.wait(timeout)
+    finally:
+        os.close(master)
+        if slave is not None:
+            os.close(slave)
+    # The terminal turns \n into \r\n
+    return time.perf_counter() - start, b''.join(chunks).replace(b'\r\n', b'\n')
+
+
+def _best(binary, terminal, repeat, timeout):
+    best, output = float('inf'), None
+    for _ in range(repeat):
+        elapsed, output = _run(binary, terminal, timeout)
+        best = min(best, elapsed)
+    return best, output
+
+
+def run_print_benchmark(lines=20000, repeat=3, timeout=60, programs=None):
+    """Compare unbuffered and buffered C output for each print-heavy program"""
+    compiler = find_compiler()
+    if compiler is None:
+        raise RuntimeError("no C compiler found (set $CC)")
+    modes = ['pipe'] + (['terminal'] if _terminal_available() else [])
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, template in (programs or PRINT_PROGRAMS).items():
+            ast = parse_source(template.format(lines=lines), 'python')
+            binaries = {}
+            for buffered in (False, True):
+                source = os.path.join(tmp, f"{name}_{int(buffered)}.c")
+                binary = source[:-2]
+                with open(source, 'w') as f:
+                    f.write(generate_output(ast, 'c', buffered_output=buffered))
+                subprocess.run([compiler, '-O2', '-w', source, '-o', binary], check=True,
+                               capture_output=True, timeout=timeout)
+                binaries[buffered] = binary
+            for mode in modes:
+                before, before_output = _best(binaries[False], mode == 'terminal', repeat, timeout)
+                after, after_output = _best(binaries[True], mode == 'terminal', repeat, timeout)
+                rows.append({
+                    'program': name,
+                    'mode': mode,
+                    'lines': before_output.count(b'\n'),
+                    'unbuffered_time': before,
+                    'buffered_time': after,
+                    'speedup': before / after if after else float('inf'),
+                    'same_output': before_output == after_output,
+                })
+    return {'lines': lines, 'results': rows}
+
+
+def format_print_benchmark(data):
+    lines = [f"{'program':<10}{'stdout':<10}{'lines':>8}{'before ms':>11}{'after ms':>10}{'speedup':>9}"]
+    for row in data['results']:
+        flag = '' if row['same_output'] else '  OUTPUT DIFFERS'
+        lines.append(f"{row['program']:<10}{row['mode']:<10}{row['lines']:>8}"
+                     f"{row['unbuffered_time'] * 1000:>11.2f}{row['buffered_time'] * 1000:>10.2f}"
+                     f"{row['speedup']:>8.1f}x{flag}")
+    return '\n'.join(lines)
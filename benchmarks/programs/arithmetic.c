@@ -0,0 +1,9 @@
+int main() {
+    int a = 7;
+    int b = 3;
+    int c = a * b + a - b;
+    printf("%d\n", c);
+    c = c % 5;
+    printf("%d\n", c);
+    return 0;
+}
@@ -0,0 +1,16 @@
+int main() {
+    int values[5];
+    values[0] = 4;
+    values[1] = 8;
+    values[2] = 15;
+    values[3] = 16;
+    values[4] = 23;
+    int sum = 0;
+    int i = 0;
+    while (i < 5) {
+        sum = sum + values[i];
+        i = i + 1;
+    }
+    printf("%d\n", sum);
+    return 0;
+}
@@ -0,0 +1,17 @@
+int classify(int n) {
+    if (n > 100) {
+        return 2;
+    } else {
+        if (n > 10) {
+            return 1;
+        }
+    }
+    return 0;
+}
+
+int main() {
+    printf("%d\n", classify(5));
+    printf("%d\n", classify(50));
+    printf("%d\n", classify(500));
+    return 0;
+}
@@ -0,0 +1,7 @@
+int main() {
+    int a = 7;
+    int b = 2;
+    int q = a / b;
+    printf("%d\n", q);
+    return 0;
+}
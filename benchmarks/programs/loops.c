@@ -0,0 +1,14 @@
+int main() {
+    int total = 0;
+    int i = 0;
+    while (i < 200000) {
+        total = total + i % 7;
+        i = i + 1;
+    }
+    printf("%d\n", total);
+    int j = 0;
+    for (j = 0; j < 5; j = j + 1) {
+        printf("%d\n", j);
+    }
+    return 0;
+}
@@ -0,0 +1,13 @@
+int fib(int n) {
+    if (n < 2) {
+        return n;
+    } else {
+        return fib(n - 1) + fib(n - 2);
+    }
+}
+
+int main() {
+    int result = fib(20);
+    printf("%d\n", result);
+    return 0;
+}
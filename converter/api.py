@@ -0,0 +1,117 @@
+"""In-process conversion API for embedding the converter.
+
+convert() runs on the calling thread using that thread's warm parsers, so
+concurrent callers never share a pycparser instance or wait on a common lock.
+ConverterPool adds a bounded thread pool with backpressure and timeouts for
+asyncio services.
+"""
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from .pipeline import parse_source, generate_output
+
+LANGUAGES = ('c', 'python')
+
+
+class ConversionOptions:
+    """Knobs for a single conversion"""
+
+    def __init__(self, jobs=1, timeout=None, profiler=None, c_parser='fast', buffered_output=True):
+        self.jobs = jobs            # processes for transform/generate (see --jobs)
+        self.c_parser = c_parser    # 'fast' (with pycparser fallback) or 'pycparser'
+        self.buffered_output = buffered_output  # block-buffer stdout in C that prints in loops
+        self.timeout = timeout      # seconds; only enforced by ConverterPool
+        self.profiler = profiler    # optional converter.profiling.Profiler
+
+
+class QueueFullError(RuntimeError):
+    """Raised when a ConverterPool already holds its maximum pending conversions"""
+
+
+def convert(source, input_lang, target_lang=None, options=None):
+    """Convert source code and return the generated code.
+
+    target_lang defaults to the other language. Safe to call from many
+    threads at once, including with options.jobs > 1: each call gets its own
+    process pool, started without fork when other threads are running.
+    """
+    if input_lang not in LANGUAGES:
+        raise ValueError(f"Unsupported input language: {input_lang}")
+    target_lang = target_lang or ('python' if input_lang == 'c' else 'c')
+    options = options or ConversionOptions()
+    intermediate_ast = parse_source(source, input_lang, options.profiler, options.jobs, options.c_parser)
+    return generate_output(intermediate_ast, target_lang, options.profiler, jobs=options.jobs,
+                           buffered_output=options.buffered_output)
+
+
+class ConverterPool:
+    """Runs conversions on a bounded thread pool.
+
+    At most max_pending conversions may be running or queued; further
+    submissions raise QueueFullError instead of piling up.
+    """
+
+    def __init__(self, max_workers=4, max_pending=None):
+        self.max_pending = max_pending or max_workers * 4
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='converter')
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+
+    def submit(self, source, input_lang, target_lang=None, options=None):
+        """Queue a conversion and return a concurrent.futures.Future"""
+        if not self._slots.acquire(blocking=False):
+            raise QueueFullError(f"{self.max_pending} conversions already pending")
+        try:
+            future = self._executor.submit(convert, source, input_lang, target_lang, options)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    def convert(self, source, input_lang, target_lang=None, options=None):
+        """Convert on the pool and wait for the result, honouring options.timeout"""
+        future = self.submit(source, input_lang, target_lang, options)
+        timeout = options.timeout if options else None
+        try:
+            return future.result(timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            raise
+
+    async def convert_async(self, source, input_lang, target_lang=None, options=None):
+        """Awaitable convert(); raises asyncio.TimeoutError after options.timeout"""
+        future = self.submit(source, input_lang, target_lang, options)
+        timeout = options.timeout if options else None
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+        except asyncio.TimeoutError:
+            # A conversion that has already started cannot be interrupted; it
+            # finishes in the background and then frees its slot
+            future.cancel()
+            raise
+
+    def shutdown(self, wait=True):
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
+
+
+_default_pool = None
+_default_pool_lock = threading.Lock()
+
+
+def _get_default_pool():
+    global _default_pool
+    with _default_pool_lock:
+        if _default_pool is None:
+            _default_pool = ConverterPool()
+        return _default_pool
+
+
+async def convert_async(source, input_lang, target_lang=None, options=None):
+    """Async counterpart of convert() using a shared ConverterPool"""
+    return await _get_default_pool().convert_async(source, input_lang, target_lang, options)
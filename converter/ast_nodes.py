@@ -78,4 +78,38 @@ class Dereference(ASTNode):
 
 class AddressOf(ASTNode):
     def __init__(self, var_name):
-        self.var_name = var_name 
\ No newline at end of file
+        self.var_name = var_name
+
+class BinaryOp(ASTNode):
+    """Binary expression with a node operand; plain operands stay strings like "a + b"."""
+    def __init__(self, left, op, right):
+        self.left = left
+        self.op = op
+        self.right = right
+
+class List(ASTNode):
+    """Growable list (Python list); emitted as a dynamic array in C"""
+    def __init__(self, name, element_type, values=None):
+        self.name = name
+        self.element_type = element_type
+        self.values = values or []  # initial elements
+
+class ListAppend(ASTNode):
+    def __init__(self, list_name, value):
+        self.list_name = list_name
+        self.value = value
+
+class ListAssign(ASTNode):
+    """Rebinding an existing list to new elements, e.g. a second `xs = [1, 2]`"""
+    def __init__(self, list_name, values=None):
+        self.list_name = list_name
+        self.values = values or []
+
+class ListLength(ASTNode):
+    def __init__(self, list_name):
+        self.list_name = list_name
+
+class ListAccess(ASTNode):
+    def __init__(self, list_name, index):
+        self.list_name = list_name
+        self.index = index
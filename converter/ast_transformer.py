@@ -4,7 +4,8 @@ from converter.ast_nodes import (Program, VarDecl, Assignment, Print, If, While,
 from pycparser.c_ast import (FileAST, Decl, Assignment as CAssignment, Constant, 
                             FuncCall as CFuncCall, ID, If as CIf, While as CWhile, 
                             For as CFor, FuncDef, BinaryOp, Return as CReturn,
-                            ArrayDecl, ArrayRef, PtrDecl, UnaryOp)
+                            ArrayDecl, ArrayRef, PtrDecl, UnaryOp, TypeDecl,
+                            IdentifierType)
 
 class ASTTransformer:
     def transform(self, c_ast):
@@ -26,12 +27,36 @@ class ASTTransformer:
             elif isinstance(node.type, PtrDecl):
                 return self._transform_pointer_decl(node)
             else:
-                var_type = getattr(node.type, 'type', None)
+                var_type = self._type_name(node.type)
                 var_name = node.name
                 value = None
                 if node.init:
                     value = self._transform_expr(node.init)
                 return VarDecl(var_type, var_name, value)
+        elif isinstance(node, FuncDef):
+            # Transform function definition
+            func_name = node.decl.name
+            return_type = self._type_name(node.decl.type.type) or 'void'
+            
+            # Extract parameters
+            params = []
+            if node.decl.type.args:
+                for param in node.decl.type.args.params:
+                    if param.name is None:  # e.g. main(void)
+                        continue
+                    param_type = self._type_name(param.type)
+                    param_name = param.name
+                    params.append((param_type, param_name))
+            
+            # Transform function body
+            body = []
+            if hasattr(node.body, 'block_items') and node.body.block_items:
+                for item in node.body.block_items:
+                    s = self._transform_node(item)
+                    if s:
+                        body.append(s)
+            
+            return Function(func_name, params, return_type, body)
         elif hasattr(node, 'body') and hasattr(node.body, 'block_items'):
             stmts = []
             for item in node.body.block_items or []:
@@ -56,28 +81,6 @@ class ASTTransformer:
             increment = self._transform_node(node.next) if node.next else None
             body = [self._transform_node(s) for s in (node.stmt.block_items or [])] if node.stmt else []
             return For(init, condition, increment, body)
-        elif isinstance(node, FuncDef):
-            # Transform function definition
-            func_name = node.decl.name
-            return_type = getattr(node.decl.type.type, 'type', 'void')
-            
-            # Extract parameters
-            params = []
-            if node.decl.type.args:
-                for param in node.decl.type.args.params:
-                    param_type = getattr(param.type, 'type', None)
-                    param_name = param.name
-                    params.append((param_type, param_name))
-            
-            # Transform function body
-            body = []
-            if hasattr(node.body, 'block_items') and node.body.block_items:
-                for item in node.body.block_items:
-                    s = self._transform_node(item)
-                    if s:
-                        body.append(s)
-            
-            return Function(func_name, params, return_type, body)
         elif isinstance(node, CReturn):
             value = self._transform_expr(node.expr) if node.expr else None
             return Return(value)
@@ -91,6 +94,9 @@ class ASTTransformer:
                         return Print(self._transform_expr(args[1]))
                     # Otherwise, print the first arg
                     return Print(self._transform_expr(args[0]))
+            elif func_name == 'cc_print_double' and node.args:
+                # How our own C output prints a double
+                return Print(self._transform_expr(node.args.exprs[0]))
             else:
                 # Regular function call
                 args = [self._transform_expr(arg) for arg in (node.args.exprs if node.args else [])]
@@ -127,7 +133,7 @@ class ASTTransformer:
         """Transform array declaration"""
         array_name = node.name
         array_type = node.type
-        element_type = getattr(array_type.type, 'type', 'int')
+        element_type = self._type_name(array_type.type) or 'int'
         
         # Get array size
         size = None
@@ -144,10 +150,21 @@ class ASTTransformer:
     def _transform_pointer_decl(self, node):
         """Transform pointer declaration"""
         pointer_name = node.name
-        target_type = getattr(node.type.type, 'type', 'int')
+        target_type = self._type_name(node.type.type) or 'int'
         
         value = None
         if node.init:
             value = self._transform_expr(node.init)
         
-        return Pointer(pointer_name, target_type, value) 
\ No newline at end of file
+        return Pointer(pointer_name, target_type, value) 
+    
+    def _type_name(self, type_node):
+        """Turn a pycparser type node into a C type string like 'int' or 'char*'"""
+        if isinstance(type_node, IdentifierType):
+            return ' '.join(type_node.names)
+        elif isinstance(type_node, TypeDecl):
+            return self._type_name(type_node.type)
+        elif isinstance(type_node, PtrDecl):
+            inner = self._type_name(type_node.type)
+            return f"{inner}*" if inner else None
+        return None
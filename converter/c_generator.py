@@ -1,9 +1,118 @@
-from .ast_nodes import (Program, VarDecl, Assignment, Print, If, While, For,
+import os
+import re
+from collections.abc import Sequence
+from functools import lru_cache
+from .ast_nodes import (ASTNode, Program, VarDecl, Assignment, Print, If, While, For,
                         Function, FunctionCall, Return, Array, ArrayAccess,
-                        Pointer, Dereference, AddressOf)
+                        Pointer, Dereference, AddressOf, BinaryOp,
+                        List, ListAppend, ListAssign, ListLength, ListAccess)
 
-def generate_c(ast, indent=0):
-    """Generate C code from our AST"""
+RUNTIME_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'runtime')
+
+# First statements of main() when the program prints inside loops: stdout is
+# then fully buffered in 64 KiB blocks (flushed at exit) instead of flushing
+# every line on a terminal. The buffer must be ours; glibc ignores the size
+# when setvbuf is given NULL and keeps its default 1-4 KiB buffer.
+STDOUT_BUFFERING = ("static char cc_stdout_buf[1 << 16];",
+                    "setvbuf(stdout, cc_stdout_buf, _IOFBF, sizeof cc_stdout_buf);")
+
+def generate_c(ast, indent=0, buffered_output=True):
+    """Generate C code from our AST, preceded by any runtime support it needs"""
+    info = CProgramInfo(ast, buffered_output)
+    code = generate_c_body(ast, indent, info)
+    prelude = c_prelude(ast, info=info)
+    return f"{prelude}\n\n{code}" if prelude else code
+
+class CProgramInfo:
+    """Whole-program facts the C backend needs before it emits a statement"""
+
+    def __init__(self, ast, buffered_output=True):
+        self.functions = {}  # function name -> return type
+        self.list_types = set()
+        self.has_print = False
+        self.has_floating = False  # any floating type or literal, i.e. doubles may be printed
+        self.globals = dict(_declarations(ast.statements))
+        prints_in_loops = False
+        stack = [(ast, False)]
+        while stack:
+            item, in_loop = stack.pop()
+            if isinstance(item, ASTNode):
+                if isinstance(item, Function):
+                    self.functions[item.name] = item.return_type or 'void'
+                elif isinstance(item, List):
+                    self.list_types.add(item.element_type or 'int')
+                elif isinstance(item, Print):
+                    self.has_print = True
+                    prints_in_loops = prints_in_loops or in_loop
+                in_loop = in_loop or isinstance(item, (While, For))
+                stack.extend((value, in_loop) for value in vars(item).values())
+            elif isinstance(item, Sequence) and not isinstance(item, str):
+                stack.extend((value, in_loop) for value in item)
+            elif isinstance(item, float) or (isinstance(item, str) and _FLOATING.search(item)):
+                self.has_floating = True
+        self.buffered = buffered_output and prints_in_loops and 'main' in self.functions
+
+def c_prelude(ast, for_parsing=False, info=None):
+    """Includes, runtime code and type definitions the generated C relies on, or ''.
+
+    With for_parsing=True only bare typedefs are returned, which is enough
+    for pycparser to read the generated code back without the preprocessor.
+    """
+    info = info or CProgramInfo(ast)
+    list_types = sorted(info.list_types)
+    if for_parsing:
+        return '\n'.join(f"typedef struct cc_list {_list_type(t)};" for t in list_types)
+    lines = []
+    # Both runtime files include stdio.h
+    if list_types:
+        lines.append(_runtime_source('cc_list.h').rstrip('\n'))
+    if info.has_print and info.has_floating:
+        lines.append(_runtime_source('cc_print.h').rstrip('\n'))
+    if not lines:
+        return '#include <stdio.h>' if info.has_print or info.buffered else ''
+    if list_types:
+        lines.append('\n'.join(f"CC_LIST_TYPE({_list_type(t)}, {t});" for t in list_types))
+    return '\n\n'.join(lines)
+
+@lru_cache(maxsize=None)
+def _runtime_source(name):
+    with open(os.path.join(RUNTIME_DIR, name)) as f:
+        return f.read()
+
+def _list_type(element_type):
+    """C struct name for a list of element_type, e.g. cc_list_int or cc_list_char_ptr"""
+    return 'cc_list_' + element_type.replace('*', '_ptr').replace(' ', '_')
+
+def _iter_nodes(node):
+    stack = [node]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, ASTNode):
+            yield item
+            stack.extend(vars(item).values())
+        elif isinstance(item, Sequence) and not isinstance(item, str):  # includes lazily loaded IR
+            stack.extend(item)
+
+def _declarations(statements):
+    """(name, C type) for everything declared in statements, including nested blocks"""
+    for node in _iter_nodes(list(statements)):
+        if isinstance(node, VarDecl):
+            yield node.var_name, node.var_type or 'int'
+        elif isinstance(node, Array):
+            yield node.name, (node.element_type or 'int') + '[]'
+        elif isinstance(node, List):
+            yield node.name, _list_type(node.element_type or 'int')
+        elif isinstance(node, Pointer):
+            yield node.name, (node.target_type or 'int') + '*'
+
+def generate_c_body(ast, indent=0, info=None, types=None):
+    """Generate C code from our AST without the runtime prelude.
+
+    `types` maps the names in scope to their C types; it is used to choose
+    printf formats.
+    """
+    info = info or CProgramInfo(ast)
+    types = info.globals if types is None else types
     lines = []
     ind = '    ' * indent
     
@@ -15,50 +124,67 @@ def generate_c(ast, indent=0):
             else:
                 lines.append(f"{ind}{var_type} {stmt.var_name};")
         elif isinstance(stmt, Assignment):
-            lines.append(f"{ind}{stmt.var_name} = {_format_c_expression(stmt.value)};")
+            lines.append(f"{ind}{_format_c_expression(stmt.var_name)} = {_format_c_expression(stmt.value)};")
         elif isinstance(stmt, Print):
-            lines.append(f'{ind}printf("%s\\n", {_format_c_expression(stmt.value)});')
+            value_type = _expression_type(stmt.value, types, info.functions)
+            element_type = _list_element_type(value_type)
+            if element_type == 'double':
+                lines.append(f'{ind}cc_list_print_doubles({_format_c_expression(stmt.value)});')
+            elif element_type:
+                c_format = "'%s'" if element_type == 'char*' else _PRINTF_FORMATS.get(element_type, '%d')
+                lines.append(f'{ind}cc_list_print({_format_c_expression(stmt.value)}, "{c_format}");')
+            elif _normalize_type(value_type) == 'double':
+                # printf has no format that prints doubles the way Python does
+                lines.append(f'{ind}cc_print_double({_format_c_expression(stmt.value)}, "\\n");')
+            else:
+                c_format, value = _printf_argument(stmt.value, types, info.functions)
+                lines.append(f'{ind}printf("{c_format}\\n", {value});')
         elif isinstance(stmt, If):
-            lines.append(f"{ind}if ({stmt.condition}) {{")
+            lines.append(f"{ind}if ({_format_c_expression(stmt.condition)}) {{")
             for s in stmt.then_body:
-                lines.extend(generate_c(Program([s]), indent+1).split('\n'))
+                lines.extend(generate_c_body(Program([s]), indent+1, info, types).split('\n'))
             if stmt.else_body:
                 lines.append(f"{ind}}} else {{")
                 for s in stmt.else_body:
-                    lines.extend(generate_c(Program([s]), indent+1).split('\n'))
+                    lines.extend(generate_c_body(Program([s]), indent+1, info, types).split('\n'))
             lines.append(f"{ind}}}")
         elif isinstance(stmt, While):
-            lines.append(f"{ind}while ({stmt.condition}) {{")
+            lines.append(f"{ind}while ({_format_c_expression(stmt.condition)}) {{")
             for s in stmt.body:
-                lines.extend(generate_c(Program([s]), indent+1).split('\n'))
+                lines.extend(generate_c_body(Program([s]), indent+1, info, types).split('\n'))
             lines.append(f"{ind}}}")
         elif isinstance(stmt, For):
-            init_str = generate_c(Program([stmt.init]), 0).strip() if stmt.init else ""
+            init_str = generate_c_body(Program([stmt.init]), 0, info, types).strip() if stmt.init else ""
             if init_str.endswith(';'):
                 init_str = init_str[:-1]  # Remove semicolon
-            condition_str = stmt.condition if stmt.condition else ""
-            increment_str = generate_c(Program([stmt.increment]), 0).strip() if stmt.increment else ""
+            condition_str = _format_c_expression(stmt.condition) if stmt.condition else ""
+            increment_str = generate_c_body(Program([stmt.increment]), 0, info, types).strip() if stmt.increment else ""
             if increment_str.endswith(';'):
                 increment_str = increment_str[:-1]  # Remove semicolon
             
             lines.append(f"{ind}for ({init_str}; {condition_str}; {increment_str}) {{")
             for s in stmt.body:
-                lines.extend(generate_c(Program([s]), indent+1).split('\n'))
+                lines.extend(generate_c_body(Program([s]), indent+1, info, types).split('\n'))
             lines.append(f"{ind}}}")
         elif isinstance(stmt, Function):
             # Generate C function
             return_type = stmt.return_type or 'void'
             params_str = ', '.join([f"{param[0]} {param[1]}" for param in stmt.params])
             lines.append(f"{ind}{return_type} {stmt.name}({params_str}) {{")
+            if stmt.name == 'main' and info.buffered:
+                lines.extend(f"{ind}    {line}" for line in STDOUT_BUFFERING)
             if stmt.body:
+                scope = dict(types)
+                scope.update((param[1], param[0] or 'int') for param in stmt.params)
+                scope.update(_declarations(stmt.body))
                 for s in stmt.body:
-                    lines.extend(generate_c(Program([s]), indent+1).split('\n'))
+                    lines.extend(generate_c_body(Program([s]), indent+1, info, scope).split('\n'))
             lines.append(f"{ind}}}")
         elif isinstance(stmt, FunctionCall):
             args_str = ', '.join([_format_c_expression(arg) for arg in stmt.args])
             lines.append(f"{ind}{stmt.name}({args_str});")
         elif isinstance(stmt, Return):
-            if stmt.value:
+            if stmt.value is not None:
                 lines.append(f"{ind}return {_format_c_expression(stmt.value)};")
             else:
                 lines.append(f"{ind}return;")
@@ -74,9 +200,166 @@ def generate_c(ast, indent=0):
                 lines.append(f"{ind}{target_type}* {stmt.name} = {_format_c_expression(stmt.value)};")
             else:
                 lines.append(f"{ind}{target_type}* {stmt.name};")
+        elif isinstance(stmt, List):
+            element_type = stmt.element_type or 'int'
+            lines.append(f"{ind}{_list_type(element_type)} {stmt.name} = {{0}};")
+            if stmt.values:
+                values_str = ', '.join(_format_c_expression(value) for value in stmt.values)
+                lines.append(f"{ind}cc_list_extend({stmt.name}, (({element_type}[]){{{values_str}}}), {len(stmt.values)});")
+        elif isinstance(stmt, ListAppend):
+            lines.append(f"{ind}cc_list_append({stmt.list_name}, {_format_c_expression(stmt.value)});")
+        elif isinstance(stmt, ListAssign):
+            # The list keeps its storage; only its contents are replaced
+            lines.append(f"{ind}cc_list_clear({stmt.list_name});")
+            if stmt.values:
+                element_type = _list_element_type(types.get(stmt.list_name)) or 'int'
+                values_str = ', '.join(_format_c_expression(value) for value in stmt.values)
+                lines.append(f"{ind}cc_list_extend({stmt.list_name}, (({element_type}[]){{{values_str}}}), {len(stmt.values)});")
     
     return '\n'.join(lines)
 
+_PRINTF_FORMATS = {
+    'int': '%d', 'short': '%d', '_Bool': '%d', 'bool': '%d', 'char': '%c',
+    'unsigned': '%u', 'unsigned short': '%u', 'unsigned char': '%u',
+    'long': '%ld', 'unsigned long': '%lu', 'long long': '%lld', 'unsigned long long': '%llu',
+    # Enough digits to tell values apart; doubles that are printed on their own
+    # or in a list go through cc_print_double instead, which matches Python
+    'size_t': '%zu', 'float': '%.7g', 'double': '%.17g', 'long double': '%.15Lg',
+    'char*': '%s', 'unsigned char*': '%s',
+}
+_INTEGER_RANK = ['int', 'unsigned', 'long', 'unsigned long', 'long long', 'unsigned long long']
+_QUALIFIERS = {'const', 'volatile', 'static', 'extern', 'register', 'signed', 'inline'}
+_COMPARISONS = {'<', '>', '<=', '>=', '==', '!=', '&&', '||', '!'}
+_FLOATING = re.compile(r'\b(?:double|float)\b|\d\.|\.\d|\d[eE][-+]?\d')
+_TOKEN = re.compile(r'"(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])+\'|(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?\w*'
+                    r'|[A-Za-z_]\w*|&&|\|\||[<>=!]=|\S')
+
+def _printf_argument(expr, types, functions):
+    """printf format and argument for printing expr, chosen from its C type.
+
+    Types we cannot work out are printed as int, the converter's default type.
+    """
+    value = _format_c_expression(expr)
+    c_type = _normalize_type(_expression_type(expr, types, functions))
+    if c_type in _PRINTF_FORMATS:
+        return _PRINTF_FORMATS[c_type], value
+    if c_type and c_type.endswith('*'):
+        return '%p', f"(void *)({value})"
+    return '%d', value
+
+def _normalize_type(c_type):
+    """Canonical spelling of a C type: 'const long int *' -> 'long*'"""
+    if not c_type:
+        return None
+    stars = c_type.count('*')
+    words = [w for w in c_type.replace('*', ' ').split() if w not in _QUALIFIERS]
+    if len(words) > 1 and words[-1] == 'int':
+        words.pop()  # 'long int' is 'long', 'unsigned int' is 'unsigned'
+    return ' '.join(words or ['int']) + '*' * stars
+
+def _list_element_type(c_type):
+    """Element type of a list struct type: 'char*' for cc_list_char_ptr, else None"""
+    if c_type and c_type.startswith('cc_list_'):
+        return c_type[len('cc_list_'):].replace('_ptr', '*').replace('_', ' ')
+    return None
+
+def _element_type(container):
+    list_element = _list_element_type(container)
+    if list_element:
+        return list_element
+    if container and container.endswith('[]'):
+        return container[:-2]
+    if container and container.endswith('*'):
+        return container[:-1].rstrip()
+    return None
+
+def _promote(operand_types):
+    """Type of an arithmetic expression over operands of the given types"""
+    known = [_normalize_type(t) for t in operand_types if t]
+    if not known:
+        return None
+    if len(operand_types) == 1:
+        return known[0]  # a lone char or short is printed as itself, not promoted
+    for floating in ('long double', 'double', 'float'):
+        if floating in known:
+            return floating
+    pointers = [t for t in known if t.endswith('*')]
+    if pointers:
+        return pointers[0]
+    ranks = [_INTEGER_RANK.index(t) for t in known if t in _INTEGER_RANK]
+    return _INTEGER_RANK[max(ranks)] if ranks else 'int'
+
+def _expression_type(expr, types, functions):
+    """Best-effort C type of an expression, or None if it cannot be told"""
+    if isinstance(expr, bool) or isinstance(expr, int):
+        return 'int'
+    if isinstance(expr, float):
+        return 'double'
+    if isinstance(expr, ArrayAccess):
+        name = expr.array_name
+        return _element_type(types.get(name) if isinstance(name, str) else _expression_type(name, types, functions))
+    if isinstance(expr, ListAccess):
+        return _element_type(types.get(expr.list_name))
+    if isinstance(expr, ListLength):
+        return 'int'
+    if isinstance(expr, FunctionCall):
+        return functions.get(expr.name)
+    if isinstance(expr, Dereference):
+        return _element_type(_expression_type(expr.pointer_name, types, functions))
+    if isinstance(expr, AddressOf):
+        target = _expression_type(expr.var_name, types, functions)
+        return target + '*' if target else None
+    if isinstance(expr, BinaryOp):
+        if expr.op in _COMPARISONS:
+            return 'int'
+        return _promote([_expression_type(expr.left, types, functions),
+                         _expression_type(expr.right, types, functions)])
+    if isinstance(expr, str):
+        return _text_type(expr, types, functions)
+    return None
+
+def _text_type(text, types, functions):
+    """Type of an expression kept as text, such as 'a + b * 2.5' or '"hi"'"""
+    tokens = [match.group() for match in _TOKEN.finditer(text)]
+    if tokens and all(token.startswith('"') for token in tokens):
+        return 'char*'
+    if len(tokens) == 1 and tokens[0].startswith("'"):
+        return 'char'
+    operand_types = []
+    i = 0
+    while i < len(tokens):
+        token = tokens[i]
+        following = tokens[i + 1] if i + 1 < len(tokens) else ''
+        if token in _COMPARISONS:
+            return 'int'
+        if token[0].isdigit() or (token[0] == '.' and len(token) > 1):
+            number = token.lower()
+            is_float = ('.' in number or 'e' in number) and not number.startswith('0x')
+            operand_types.append('double' if is_float else 'long' if number.endswith('l') else 'int')
+        elif token[0].isalpha() or token[0] == '_':
+            if following in ('(', '['):
+                found = functions.get(token) if following == '(' else _element_type(types.get(token))
+                operand_types.append(found)
+                i = _skip_group(tokens, i + 1)  # arguments and indices don't affect the type
+                continue
+            operand_types.append(types.get(token))
+        elif token[0] in '"\'':
+            return None  # string or char pieces inside a larger expression
+        i += 1
+    return _promote(operand_types)
+
+def _skip_group(tokens, i):
+    """Index just past the bracketed group that opens at tokens[i]"""
+    depth = 0
+    for j in range(i, len(tokens)):
+        if tokens[j] in ('(', '['):
+            depth += 1
+        elif tokens[j] in (')', ']'):
+            depth -= 1
+            if depth == 0:
+                return j + 1
+    return len(tokens)
+
 def _format_c_expression(expr):
     """Format expressions for C output"""
     if isinstance(expr, ArrayAccess):
@@ -88,5 +371,11 @@ def _format_c_expression(expr):
     elif isinstance(expr, FunctionCall):
         args_str = ', '.join([_format_c_expression(arg) for arg in expr.args])
         return f"{expr.name}({args_str})"
+    elif isinstance(expr, ListAccess):
+        return f"cc_list_at({expr.list_name}, {_format_c_expression(expr.index)})"
+    elif isinstance(expr, ListLength):
+        return f"cc_list_len({expr.list_name})"
+    elif isinstance(expr, BinaryOp):
+        return f"{_format_c_expression(expr.left)} {expr.op} {_format_c_expression(expr.right)}"
     else:
         return str(expr)
@@ -0,0 +1,47 @@
+"""Structural comparison of two intermediate ASTs"""
+from collections.abc import Sequence
+from .ast_nodes import ASTNode
+
+
+def _is_sequence(value):
+    # LazyStatements from a loaded IR file counts as a list here
+    return isinstance(value, Sequence) and not isinstance(value, str)
+
+
+def _scalar_text(value):
+    # C constants are kept as source text ('5') while Python ones are values (5),
+    # so scalars are compared by their text form
+    return str(value).strip()
+
+
+def diff_ir(expected, actual, max_differences=50):
+    """Return a list of 'path: description' strings where the trees differ"""
+    differences = []
+    stack = [('program', expected, actual)]
+    while stack and len(differences) < max_differences:
+        path, a, b = stack.pop()
+        if isinstance(a, ASTNode) or isinstance(b, ASTNode):
+            if type(a) is not type(b):
+                differences.append(f"{path}: {_describe(a)} != {_describe(b)}")
+                continue
+            fields = list(vars(a))
+            for field in reversed(fields):
+                stack.append((f"{path}.{field}", getattr(a, field, None), getattr(b, field, None)))
+        elif _is_sequence(a) and _is_sequence(b):
+            if len(a) != len(b):
+                differences.append(f"{path}: length {len(a)} != {len(b)}")
+            for i in reversed(range(min(len(a), len(b)))):
+                stack.append((f"{path}[{i}]", a[i], b[i]))
+        elif _is_sequence(a) or _is_sequence(b):
+            differences.append(f"{path}: {_describe(a)} != {_describe(b)}")
+        elif _scalar_text(a) != _scalar_text(b):
+            differences.append(f"{path}: {a!r} != {b!r}")
+    return differences
+
+
+def _describe(value):
+    if isinstance(value, ASTNode):
+        return type(value).__name__
+    if _is_sequence(value):
+        return f"sequence of {len(value)}"
+    return repr(value)
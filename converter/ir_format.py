@@ -0,0 +1,256 @@
+"""Compact binary serialization of our intermediate AST.
+
+Layout (all integers little-endian u32 unless noted):
+
+    header   magic b'CCIR', u16 version, u8 source language, u8 reserved,
+             counts of types, strings, values and child indices, root value
+    types    string index of each node class name
+    strings  offsets[count + 1] followed by the UTF-8 blob, padded to 4 bytes
+    values   (tag, a, b) triples -- the node table
+    children value indices referenced by lists and nodes
+
+A node's fields are stored as a run of child indices in constructor argument
+order; identical scalars share a single value entry. Loading memory-maps the
+file; top-level statements and strings are decoded on first access.
+"""
+import inspect
+import mmap
+import struct
+from array import array
+from collections.abc import Sequence
+from . import ast_nodes
+from .ast_nodes import ASTNode, Program
+
+MAGIC = b'CCIR'
+VERSION = 1
+_HEADER = struct.Struct('<4sHBB5I')
+
+# value tags; node tags are NODE_BASE + index into the type table
+NONE, TRUE, FALSE, SMALL_INT, BIG_INT, FLOAT, STR, LIST, TUPLE = range(9)
+NODE_BASE = 16
+
+_LANGUAGES = [None, 'c', 'python']
+
+
+def _node_classes():
+    return {name: cls for name, cls in vars(ast_nodes).items()
+            if isinstance(cls, type) and issubclass(cls, ASTNode) and cls is not ASTNode}
+
+
+def _fields(cls):
+    """Field names of a node class, in constructor order"""
+    return [p for p in inspect.signature(cls.__init__).parameters if p != 'self']
+
+
+class _Writer:
+    def __init__(self):
+        self.types = {}
+        self.type_fields = []
+        self.strings = {}
+        self.values = array('I')
+        self.children = array('I')
+        self.scalars = {}
+
+    def string(self, text):
+        index = self.strings.get(text)
+        if index is None:
+            index = self.strings[text] = len(self.strings)
+        return index
+
+    def _emit(self, tag, a=0, b=0):
+        self.values.extend((tag, a, b))
+        return len(self.values) // 3 - 1
+
+    def _emit_children(self, tag, items):
+        indices = [self.value(item) for item in items]
+        start = len(self.children)
+        self.children.extend(indices)
+        return self._emit(tag, start, len(indices))
+
+    def value(self, obj):
+        if isinstance(obj, (str, int, float)) or obj is None:
+            # Scalars are immutable, so repeated ones share one table entry
+            key = (type(obj), obj)
+            index = self.scalars.get(key)
+            if index is None:
+                index = self.scalars[key] = self._scalar(obj)
+            return index
+        if isinstance(obj, list):
+            return self._emit_children(LIST, obj)
+        if isinstance(obj, tuple):
+            return self._emit_children(TUPLE, obj)
+        if isinstance(obj, ASTNode):
+            cls = type(obj)
+            type_index = self.types.get(cls.__name__)
+            if type_index is None:
+                type_index = self.types[cls.__name__] = len(self.types)
+                self.type_fields.append(_fields(cls))
+            fields = self.type_fields[type_index]
+            return self._emit_children(NODE_BASE + type_index, [getattr(obj, f) for f in fields])
+        raise TypeError(f"Cannot serialize {type(obj).__name__} in IR")
+
+    def _scalar(self, obj):
+        if obj is None:
+            return self._emit(NONE)
+        if obj is True:
+            return self._emit(TRUE)
+        if obj is False:
+            return self._emit(FALSE)
+        if isinstance(obj, int):
+            if 0 <= obj < 2 ** 32:
+                return self._emit(SMALL_INT, obj)
+            return self._emit(BIG_INT, self.string(str(obj)))
+        if isinstance(obj, float):
+            return self._emit(FLOAT, self.string(repr(obj)))
+        return self._emit(STR, self.string(obj))
+
+    def to_bytes(self, root, source_lang):
+        type_names = array('I', (self.string(name) for name in self.types))
+        encoded = [s.encode() for s in self.strings]
+        offsets = array('I', [0])
+        for data in encoded:
+            offsets.append(offsets[-1] + len(data))
+        blob = b''.join(encoded)
+        blob += b'\0' * (-len(blob) % 4)
+        header = _HEADER.pack(MAGIC, VERSION, _LANGUAGES.index(source_lang), 0,
+                              len(type_names), len(encoded), len(self.values) // 3,
+                              len(self.children), root)
+        return b''.join([header, type_names.tobytes(), offsets.tobytes(), blob,
+                         self.values.tobytes(), self.children.tobytes()])
+
+
+def dumps_ir(program, source_lang=None):
+    """Serialize a Program to bytes"""
+    writer = _Writer()
+    root = writer.value(program)
+    return writer.to_bytes(root, source_lang)
+
+
+def dump_ir(program, path, source_lang=None):
+    """Serialize a Program to a file"""
+    with open(path, 'wb') as f:
+        f.write(dumps_ir(program, source_lang))
+
+
+class IRReader:
+    """Decodes values from a serialized IR buffer on demand"""
+
+    def __init__(self, buffer):
+        self._buffer = buffer
+        view = memoryview(buffer)
+        if len(view) < _HEADER.size:
+            raise ValueError("Not a CodeConverter IR file (too short)")
+        (magic, version, lang, _, type_count, string_count, value_count,
+         child_count, self.root) = _HEADER.unpack_from(view)
+        if magic != MAGIC:
+            raise ValueError("Not a CodeConverter IR file (bad magic)")
+        if version != VERSION:
+            raise ValueError(f"Unsupported IR version {version}")
+        self.source_lang = _LANGUAGES[lang] if lang < len(_LANGUAGES) else None
+
+        pos = _HEADER.size
+        type_names = view[pos:pos + 4 * type_count].cast('I')
+        pos += 4 * type_count
+        self._offsets = view[pos:pos + 4 * (string_count + 1)].cast('I')
+        pos += 4 * (string_count + 1)
+        blob_size = self._offsets[-1]
+        self._blob = view[pos:pos + blob_size]
+        pos += blob_size + (-blob_size % 4)
+        self._values = view[pos:pos + 12 * value_count].cast('I')
+        pos += 12 * value_count
+        self._children = view[pos:pos + 4 * child_count].cast('I')
+        if len(self._children) != child_count:
+            raise ValueError("Truncated IR file")
+
+        self._strings = {}
+        classes = _node_classes()
+        self._types = []
+        for name_index in type_names:
+            name = self.string(name_index)
+            if name not in classes:
+                raise ValueError(f"Unknown IR node type: {name}")
+            self._types.append((classes[name], _fields(classes[name])))
+
+    def string(self, index):
+        text = self._strings.get(index)
+        if text is None:
+            text = self._strings[index] = str(self._blob[self._offsets[index]:self._offsets[index + 1]], 'utf-8')
+        return text
+
+    def _child_indices(self, start, count):
+        return self._children[start:start + count]
+
+    def value(self, index):
+        base = 3 * index
+        tag, a, b = self._values[base], self._values[base + 1], self._values[base + 2]
+        if tag >= NODE_BASE:
+            cls, fields = self._types[tag - NODE_BASE]
+            node = cls.__new__(cls)
+            for field, child in zip(fields, self._child_indices(a, b)):
+                setattr(node, field, self.value(child))
+            return node
+        if tag == STR:
+            return self.string(a)
+        if tag == SMALL_INT:
+            return a
+        if tag == NONE:
+            return None
+        if tag == LIST:
+            return [self.value(child) for child in self._child_indices(a, b)]
+        if tag == TUPLE:
+            return tuple(self.value(child) for child in self._child_indices(a, b))
+        if tag == TRUE:
+            return True
+        if tag == FALSE:
+            return False
+        if tag == BIG_INT:
+            return int(self.string(a))
+        if tag == FLOAT:
+            return float(self.string(a))
+        raise ValueError(f"Corrupt IR value tag {tag}")
+
+    def program(self):
+        """Return the root Program with lazily decoded top-level statements"""
+        base = 3 * self.root
+        tag = self._values[base]
+        if tag < NODE_BASE or self._types[tag - NODE_BASE][0] is not Program:
+            return self.value(self.root)
+        start = self._values[base + 1]
+        statements_index = self._children[start]
+        if self._values[3 * statements_index] != LIST:
+            return self.value(self.root)
+        list_start, list_count = self._values[3 * statements_index + 1], self._values[3 * statements_index + 2]
+        return Program(LazyStatements(self, self._child_indices(list_start, list_count)))
+
+
+class LazyStatements(Sequence):
+    """Read-only list of statements decoded from IR the first time each is used"""
+
+    def __init__(self, reader, indices):
+        self._reader = reader
+        self._indices = indices
+        self._decoded = [None] * len(indices)
+
+    def __len__(self):
+        return len(self._indices)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        stmt = self._decoded[i]
+        if stmt is None:
+            stmt = self._decoded[i] = self._reader.value(self._indices[i])
+        return stmt
+
+
+def loads_ir(data):
+    """Load a Program from serialized bytes"""
+    return IRReader(data).program()
+
+
+def load_ir(path):
+    """Memory-map an IR file and return (Program, source language)"""
+    with open(path, 'rb') as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    reader = IRReader(mapped)
+    return reader.program(), reader.source_lang
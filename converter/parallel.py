@@ -0,0 +1,115 @@
+"""Process-pool transformation and generation of top-level units.
+
+Top-level declarations and function definitions don't depend on each other,
+so they can be transformed and emitted in chunks on separate cores and
+stitched back together in source order. The output is identical to serial
+mode.
+
+Pickling a pycparser tree costs more than transforming it, so where the
+'fork' start method exists each pool's workers inherit the units through the
+pool initializer, and only chunk bounds and results cross process
+boundaries. Forking is only safe while the process has a single thread, so
+callers on a multithreaded process (such as converter.api under a thread
+pool) get a forkserver or spawn pool and receive pickled chunks instead.
+"""
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from pycparser.c_ast import FileAST
+from .ast_nodes import Program
+from .ast_transformer import ASTTransformer
+from .python_generator import generate_python
+from .c_generator import generate_c, generate_c_body, c_prelude, CProgramInfo
+
+_GENERATORS = {'python': generate_python, 'c': generate_c}
+
+# Units inherited by a forked worker, set by the pool initializer in the worker
+_worker_units = None
+
+
+def default_workers():
+    return os.cpu_count() or 1
+
+
+def _chunk_bounds(count, workers, chunk_size):
+    if not chunk_size:
+        # A few chunks per worker evens out uneven function sizes
+        chunk_size = max(1, -(-count // (workers * 4)))
+    return [(start, min(start + chunk_size, count)) for start in range(0, count, chunk_size)]
+
+
+def _pool_context():
+    """(context, forked) for a new pool; forked workers inherit the parent's memory"""
+    methods = multiprocessing.get_all_start_methods()
+    if threading.active_count() == 1 and 'fork' in methods:
+        return multiprocessing.get_context('fork'), True
+    if 'forkserver' in methods:
+        return multiprocessing.get_context('forkserver'), False
+    return multiprocessing.get_context('spawn'), False
+
+
+def _set_worker_units(units):
+    global _worker_units
+    _worker_units = units
+
+
+def _units(bounds, units):
+    return _worker_units[bounds[0]:bounds[1]] if units is None else units
+
+
+def _transform_chunk(bounds, units=None):
+    return ASTTransformer().transform(FileAST(list(_units(bounds, units)))).statements
+
+
+def _generate_chunk(target_lang, info, bounds, units=None):
+    program = Program(list(_units(bounds, units)))
+    if target_lang == 'c':
+        # Whole-program info (function types, buffering) comes from the parent;
+        # the runtime prelude is added once after the chunks are joined
+        return generate_c_body(program, 0, info)
+    return generate_python(program)
+
+
+def _map_chunks(func, units, workers, chunk_size, *leading_args):
+    """Run func over chunks of `units` in a process pool, returning results in order"""
+    bounds = _chunk_bounds(len(units), workers, chunk_size)
+    context, forked = _pool_context()
+    # Forked workers get `units` through initargs without pickling, so each
+    # call's pool sees only its own units and concurrent calls can't collide
+    initializer, initargs = (_set_worker_units, (units,)) if forked else (None, ())
+    with ProcessPoolExecutor(max_workers=min(workers, len(bounds)), mp_context=context,
+                             initializer=initializer, initargs=initargs) as pool:
+        futures = [pool.submit(func, *leading_args, b, None if forked else units[b[0]:b[1]])
+                   for b in bounds]
+        return [f.result() for f in futures]
+
+
+def transform_parallel(c_ast, workers=None, chunk_size=None):
+    """ASTTransformer().transform(c_ast), spread over a process pool"""
+    workers = workers or default_workers()
+    units = list(getattr(c_ast, 'ext', []))
+    if workers < 2 or len(units) < 2:
+        return ASTTransformer().transform(c_ast)
+    statements = []
+    for chunk in _map_chunks(_transform_chunk, units, workers, chunk_size):
+        statements.extend(chunk)
+    return Program(statements)
+
+
+def generate_parallel(intermediate_ast, target_lang, workers=None, chunk_size=None, buffered_output=True):
+    """Generate target code for each top-level statement in a process pool"""
+    if target_lang not in _GENERATORS:
+        raise ValueError(f"Unsupported target language: {target_lang}")
+    workers = workers or default_workers()
+    units = list(intermediate_ast.statements)
+    if workers < 2 or len(units) < 2:
+        if target_lang == 'c':
+            return generate_c(intermediate_ast, buffered_output=buffered_output)
+        return generate_python(intermediate_ast)
+    info = CProgramInfo(intermediate_ast, buffered_output) if target_lang == 'c' else None
+    chunks = _map_chunks(_generate_chunk, units, workers, chunk_size, target_lang, info)
+    # A chunk that emits no lines contributes nothing, exactly as in serial mode
+    code = '\n'.join(chunk for chunk in chunks if chunk)
+    prelude = c_prelude(intermediate_ast, info=info) if info else ''
+    return f"{prelude}\n\n{code}" if prelude else code
@@ -0,0 +1,128 @@
+"""The conversion pipeline: parse, transform, generate and verify"""
+import os
+import threading
+from contextlib import nullcontext
+from parser.c_parser import CParser
+from parser.fast_c_parser import FastCParser, UnsupportedSyntax
+from parser.python_parser import PythonParser
+from .ast_transformer import ASTTransformer
+from .python_generator import generate_python
+from .c_generator import generate_c, c_prelude, STDOUT_BUFFERING
+from .ir_format import load_ir
+from .ir_diff import diff_ir
+from .parallel import transform_parallel, generate_parallel
+
+TARGET_EXTENSIONS = {'python': '.py', 'c': '.c'}
+
+_local = threading.local()
+
+def _parsers():
+    """Warm parsers for the calling thread; pycparser's CParser is not reentrant"""
+    parsers = getattr(_local, 'parsers', None)
+    if parsers is None:
+        parsers = _local.parsers = _ThreadParsers()
+    return parsers
+
+class _ThreadParsers:
+    def __init__(self):
+        self.c = CParser()
+        self.fast_c = FastCParser()
+        self.python = PythonParser()
+
+def detect_input_language(filename):
+    """Detect input language based on file extension"""
+    ext = os.path.splitext(filename)[1].lower()
+    if ext == '.c':
+        return 'c'
+    elif ext == '.py':
+        return 'python'
+    else:
+        raise ValueError(f"Unsupported file extension: {ext}")
+
+def output_paths(output, target_langs):
+    """Map each target to its output file; several targets share the output stem"""
+    if len(target_langs) == 1:
+        return {target_langs[0]: output}
+    stem = os.path.splitext(output)[0]
+    return {lang: stem + TARGET_EXTENSIONS[lang] for lang in target_langs}
+
+def profile_stage(profiler, name):
+    """Profile a stage if a profiler is active, otherwise do nothing"""
+    return profiler.stage(name) if profiler else nullcontext()
+
+def parse_source(input_code, input_lang, profiler=None, jobs=1, c_parser='fast'):
+    """Parse source code into our intermediate AST.
+
+    With c_parser='fast', C in the supported subset is parsed straight to our
+    AST; anything else falls back to pycparser + ASTTransformer. jobs > 1
+    spreads only that transform over processes, so C read by the fast parser
+    (like Python) is parsed serially and jobs pays off in generate_output.
+    """
+    if input_lang == 'c' and c_parser == 'fast':
+        with profile_stage(profiler, 'fast_parse') as stage:
+            try:
+                intermediate_ast = _parsers().fast_c.parse(input_code)
+            except UnsupportedSyntax:
+                intermediate_ast = None
+            if stage:
+                stage.result = intermediate_ast
+        if intermediate_ast is not None:
+            return intermediate_ast
+    if input_lang == 'c':
+        with profile_stage(profiler, 'parse') as stage:
+            source_ast = _parsers().c.parse(input_code)
+            if stage:
+                stage.result = source_ast
+        with profile_stage(profiler, 'transform') as stage:
+            if jobs > 1:
+                intermediate_ast = transform_parallel(source_ast, jobs)
+            else:
+                intermediate_ast = ASTTransformer().transform(source_ast)
+            if stage:
+                stage.result = intermediate_ast
+    else:  # python
+        # PythonParser builds our AST directly, so parse and transform are one stage
+        with profile_stage(profiler, 'parse') as stage:
+            intermediate_ast = _parsers().python.parse(input_code)
+            if stage:
+                stage.result = intermediate_ast
+    return intermediate_ast
+
+def load_intermediate(path, profiler=None):
+    """Load a serialized IR file; returns (intermediate AST, source language)"""
+    with profile_stage(profiler, 'load'):
+        return load_ir(path)
+
+def generate_output(intermediate_ast, target_lang, profiler=None, stage_name='generate', jobs=1,
+                    buffered_output=True):
+    """Generate target language code from our intermediate AST.
+
+    buffered_output=False keeps C's default stdout buffering in programs
+    that print inside loops.
+    """
+    with profile_stage(profiler, stage_name):
+        if jobs > 1:
+            return generate_parallel(intermediate_ast, target_lang, jobs, buffered_output=buffered_output)
+        if target_lang == "python":
+            return generate_python(intermediate_ast)
+        elif target_lang == "c":
+            return generate_c(intermediate_ast, buffered_output=buffered_output)
+        else:
+            raise ValueError(f"Unsupported target language: {target_lang}")
+
+def verify_roundtrip(intermediate_ast, output_code, target_lang, profiler=None):
+    """Parse generated code back and list where it differs from the source IR"""
+    with profile_stage(profiler, f'verify:{target_lang}'):
+        if target_lang == 'c':
+            prelude = c_prelude(intermediate_ast)
+            if prelude and output_code.startswith(prelude):
+                # pycparser cannot read the runtime's comments and #includes
+                output_code = c_prelude(intermediate_ast, for_parsing=True) + output_code[len(prelude):]
+            # The stdout buffering setup is generated, not part of the source program
+            for line in STDOUT_BUFFERING:
+                output_code = output_code.replace(line, '')
+        try:
+            reparsed = parse_source(output_code, target_lang)
+        except Exception as e:
+            return [f"generated {target_lang} does not parse: {e}"]
+        return diff_ir(intermediate_ast, reparsed)
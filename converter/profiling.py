@@ -0,0 +1,141 @@
+"""Per-stage profiling for the conversion pipeline"""
+import json
+import time
+import tracemalloc
+from contextlib import contextmanager
+from .ast_nodes import ASTNode
+
+
+class StageProfile:
+    """Measurements recorded for one pipeline stage"""
+
+    def __init__(self, name):
+        self.name = name
+        self.wall_time = 0.0    # seconds
+        self.cpu_time = 0.0     # seconds
+        self.peak_memory = 0    # bytes allocated above the stage's starting point
+        self.node_counts = {}   # node type name -> count
+        self.result = None      # set by the caller to have its nodes counted
+
+    @property
+    def total_nodes(self):
+        return sum(self.node_counts.values())
+
+    def to_dict(self):
+        return {
+            'stage': self.name,
+            'wall_time': self.wall_time,
+            'cpu_time': self.cpu_time,
+            'peak_memory': self.peak_memory,
+            'total_nodes': self.total_nodes,
+            'node_counts': dict(sorted(self.node_counts.items())),
+        }
+
+
+class Profiler:
+    """Records wall time, CPU time, peak memory and node counts per stage.
+
+    Hooks registered with add_hook() are called with each finished
+    StageProfile, so callers can stream measurements elsewhere.
+    """
+
+    def __init__(self, trace_memory=True):
+        self.trace_memory = trace_memory
+        self.stages = []
+        self._hooks = []
+
+    def add_hook(self, hook):
+        """Register a callable invoked with every finished StageProfile"""
+        self._hooks.append(hook)
+
+    def remove_hook(self, hook):
+        self._hooks.remove(hook)
+
+    @contextmanager
+    def stage(self, name):
+        """Profile the enclosed block as a stage called `name`"""
+        profile = StageProfile(name)
+        owns_trace = False
+        baseline = 0
+        if self.trace_memory:
+            if tracemalloc.is_tracing():
+                tracemalloc.reset_peak()
+            else:
+                tracemalloc.start()
+                owns_trace = True
+            baseline = tracemalloc.get_traced_memory()[0]
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            yield profile
+        finally:
+            profile.wall_time = time.perf_counter() - wall_start
+            profile.cpu_time = time.process_time() - cpu_start
+            if self.trace_memory:
+                profile.peak_memory = max(0, tracemalloc.get_traced_memory()[1] - baseline)
+                if owns_trace:
+                    tracemalloc.stop()
+            # Counting happens after the clocks stop so it isn't billed to the stage
+            if profile.result is not None:
+                profile.node_counts = count_nodes(profile.result)
+                profile.result = None
+            self.stages.append(profile)
+            for hook in list(self._hooks):
+                hook(profile)
+
+    def run(self, name, func, *args, **kwargs):
+        """Call func(*args, **kwargs) as a profiled stage and return its result"""
+        with self.stage(name) as profile:
+            result = func(*args, **kwargs)
+            profile.result = result
+        return result
+
+    def to_dict(self):
+        return {
+            'stages': [stage.to_dict() for stage in self.stages],
+            'total': {
+                'wall_time': sum(s.wall_time for s in self.stages),
+                'cpu_time': sum(s.cpu_time for s in self.stages),
+                'peak_memory': max((s.peak_memory for s in self.stages), default=0),
+            },
+        }
+
+    def report(self, fmt='text'):
+        """Render the recorded stages as 'text' or 'json'"""
+        if fmt == 'json':
+            return json.dumps(self.to_dict(), indent=2)
+        if fmt != 'text':
+            raise ValueError(f"Unsupported profile format: {fmt}")
+
+        lines = [f"{'stage':<16}{'wall ms':>12}{'cpu ms':>12}{'peak KiB':>12}{'nodes':>10}"]
+        for s in self.stages:
+            lines.append(f"{s.name:<16}{s.wall_time * 1000:>12.2f}{s.cpu_time * 1000:>12.2f}"
+                         f"{s.peak_memory / 1024:>12.1f}{s.total_nodes:>10}")
+        total = self.to_dict()['total']
+        lines.append(f"{'total':<16}{total['wall_time'] * 1000:>12.2f}{total['cpu_time'] * 1000:>12.2f}"
+                     f"{total['peak_memory'] / 1024:>12.1f}")
+        for s in self.stages:
+            if s.node_counts:
+                counts = ', '.join(f"{name}={count}" for name, count in sorted(s.node_counts.items()))
+                lines.append(f"{s.name} nodes: {counts}")
+        return '\n'.join(lines)
+
+
+def count_nodes(root):
+    """Count nodes by type name in an IR tree or a pycparser c_ast tree"""
+    counts = {}
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, (list, tuple)):
+            stack.extend(node)
+        elif isinstance(node, ASTNode):
+            name = type(node).__name__
+            counts[name] = counts.get(name, 0) + 1
+            stack.extend(vars(node).values())
+        elif callable(getattr(node, 'children', None)):
+            # pycparser c_ast.Node
+            name = type(node).__name__
+            counts[name] = counts.get(name, 0) + 1
+            stack.extend(child for _, child in node.children())
+    return counts
@@ -1,6 +1,7 @@
 from .ast_nodes import (Program, VarDecl, Assignment, Print, If, While, For,
                         Function, FunctionCall, Return, Array, ArrayAccess,
-                        Pointer, Dereference, AddressOf)
+                        Pointer, Dereference, AddressOf, BinaryOp,
+                        List, ListAppend, ListAssign, ListLength, ListAccess)
 
 def generate_python(ast, indent=0):
     lines = []
@@ -16,7 +17,7 @@ def generate_python(ast, indent=0):
         elif isinstance(stmt, Print):
             lines.append(f"{ind}print({_format_expression(stmt.value)})")
         elif isinstance(stmt, If):
-            lines.append(f"{ind}if {stmt.condition}:")
+            lines.append(f"{ind}if {_format_expression(stmt.condition)}:")
             for s in stmt.then_body:
                 lines.extend(generate_python(Program([s]), indent+1).split('\n'))
             if stmt.else_body:
@@ -24,14 +25,14 @@ def generate_python(ast, indent=0):
                 for s in stmt.else_body:
                     lines.extend(generate_python(Program([s]), indent+1).split('\n'))
         elif isinstance(stmt, While):
-            lines.append(f"{ind}while {stmt.condition}:")
+            lines.append(f"{ind}while {_format_expression(stmt.condition)}:")
             for s in stmt.body:
                 lines.extend(generate_python(Program([s]), indent+1).split('\n'))
         elif isinstance(stmt, For):
             # For simplicity, convert C for-loops to Python while-loops
             if stmt.init:
                 lines.extend(generate_python(Program([stmt.init]), indent).split('\n'))
-            lines.append(f"{ind}while {stmt.condition if stmt.condition else 'True'}:")
+            lines.append(f"{ind}while {_format_expression(stmt.condition) if stmt.condition else 'True'}:")
             for s in stmt.body:
                 lines.extend(generate_python(Program([s]), indent+1).split('\n'))
             if stmt.increment:
@@ -49,7 +50,7 @@ def generate_python(ast, indent=0):
             args_str = ', '.join([_format_expression(arg) for arg in stmt.args])
             lines.append(f"{ind}{stmt.name}({args_str})")
         elif isinstance(stmt, Return):
-            if stmt.value:
+            if stmt.value is not None:
                 lines.append(f"{ind}return {_format_expression(stmt.value)}")
             else:
                 lines.append(f"{ind}return")
@@ -67,6 +68,14 @@ def generate_python(ast, indent=0):
                 lines.append(f"{ind}{stmt.name} = {_format_expression(stmt.value)}")
             else:
                 lines.append(f"{ind}{stmt.name} = None")
+        elif isinstance(stmt, List):
+            values_str = ', '.join(_format_expression(value) for value in stmt.values)
+            lines.append(f"{ind}{stmt.name} = [{values_str}]")
+        elif isinstance(stmt, ListAppend):
+            lines.append(f"{ind}{stmt.list_name}.append({_format_expression(stmt.value)})")
+        elif isinstance(stmt, ListAssign):
+            values_str = ', '.join(_format_expression(value) for value in stmt.values)
+            lines.append(f"{ind}{stmt.list_name} = [{values_str}]")
     return '\n'.join(lines)
 
 def _format_expression(expr):
@@ -82,5 +91,11 @@ def _format_expression(expr):
     elif isinstance(expr, FunctionCall):
         args_str = ', '.join([_format_expression(arg) for arg in expr.args])
         return f"{expr.name}({args_str})"
+    elif isinstance(expr, ListAccess):
+        return f"{expr.list_name}[{_format_expression(expr.index)}]"
+    elif isinstance(expr, ListLength):
+        return f"len({expr.list_name})"
+    elif isinstance(expr, BinaryOp):
+        return f"{_format_expression(expr.left)} {expr.op} {_format_expression(expr.right)}"
     else:
         return str(expr) 
\ No newline at end of file
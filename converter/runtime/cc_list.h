@@ -0,0 +1,76 @@
+/* cc_list: growable arrays for Python lists converted by CodeConverter.
+ *
+ * A list is a struct of {data, len, cap}; declare one type per element
+ * type with CC_LIST_TYPE. Appends double the capacity when it runs out, so
+ * building a list of n elements costs O(n) in total. Indexing accepts
+ * Python-style negative indices and is bounds-checked unless NDEBUG is
+ * defined. Helpers are static inline so that unused ones draw no warnings.
+ */
+#include <stdio.h>
+#include <stdlib.h>
+#include <string.h>
+
+#define CC_LIST_TYPE(name, T) typedef struct { T *data; size_t len, cap; } name
+
+static inline void *cc_list_grow_(void *data, size_t *cap, size_t need, size_t elem_size)
+{
+    size_t new_cap = *cap ? *cap : 8;
+    while (new_cap < need)
+        new_cap *= 2;
+    data = realloc(data, new_cap * elem_size);
+    if (!data) {
+        fputs("cc_list: out of memory\n", stderr);
+        abort();
+    }
+    *cap = new_cap;
+    return data;
+}
+
+static inline size_t cc_list_index_(long long i, size_t len, const char *file, int line)
+{
+    if (i < 0)
+        i += (long long)len;
+#ifndef NDEBUG
+    if (i < 0 || (size_t)i >= len) {
+        fflush(stdout);  /* keep what was printed before the error */
+        fprintf(stderr, "%s:%d: list index out of range (length %zu)\n", file, line, len);
+        abort();
+    }
+#else
+    (void)file;
+    (void)line;
+#endif
+    return (size_t)i;
+}
+
+#define cc_list_reserve(l, n) \
+    ((size_t)(n) > (l).cap ? (void)((l).data = cc_list_grow_((l).data, &(l).cap, (n), sizeof *(l).data)) : (void)0)
+/* len is bumped in its own step: v may read the list, as in xs.append(len(xs)) */
+#define cc_list_append(l, v) \
+    (cc_list_reserve((l), (l).len + 1), (l).data[(l).len] = (v), (void)(l).len++)
+/* Bulk initialization: one reservation and one memcpy for n elements */
+#define cc_list_extend(l, src, n) \
+    (cc_list_reserve((l), (l).len + (n)), \
+     memcpy((l).data + (l).len, (src), (n) * sizeof *(l).data), (void)((l).len += (n)))
+#define cc_list_clear(l) ((void)((l).len = 0))
+#define cc_list_len(l) ((int)(l).len)
+#define cc_list_at(l, i) ((l).data[cc_list_index_((i), (l).len, __FILE__, __LINE__)])
+/* Prints the list the way Python does, e.g. [1, 2, 3]; fmt is the element format */
+#define cc_list_print(l, fmt) \
+    do { \
+        size_t cc_i_; \
+        fputs("[", stdout); \
+        for (cc_i_ = 0; cc_i_ < (l).len; cc_i_++) \
+            printf(cc_i_ ? ", " fmt : fmt, (l).data[cc_i_]); \
+        fputs("]\n", stdout); \
+    } while (0)
+/* The same for a list of doubles; needs cc_print.h */
+#define cc_list_print_doubles(l) \
+    do { \
+        size_t cc_i_; \
+        fputs("[", stdout); \
+        for (cc_i_ = 0; cc_i_ < (l).len; cc_i_++) \
+            cc_print_double((l).data[cc_i_], cc_i_ + 1 < (l).len ? ", " : ""); \
+        fputs("]\n", stdout); \
+    } while (0)
+#define cc_list_free(l) (free((l).data), (l).data = NULL, (void)((l).len = (l).cap = 0))
@@ -0,0 +1,49 @@
+/* cc_print: Python-style printing of doubles for code converted by CodeConverter.
+ *
+ * cc_print_double(d, end) writes d as Python's repr() does, then `end`:
+ * the shortest digits that read back as the same double, ".0" on whole
+ * numbers, and exponent form below 1e-4 and from 1e16 on.
+ */
+#include <float.h>
+#include <math.h>
+#include <stdio.h>
+#include <stdlib.h>
+#include <string.h>
+
+static inline void cc_print_double(double d, const char *end)
+{
+    char digits[32];
+    char *e;
+    int precision, exponent, decimals, subnormal = fabs(d) < DBL_MIN;
+
+    if (isnan(d) || isinf(d)) {
+        fputs(isnan(d) ? "nan" : d < 0 ? "-inf" : "inf", stdout);
+        fputs(end, stdout);
+        return;
+    }
+    /* 15 significant digits always read back as the decimal they came from,
+     * so if they round-trip, dropping their trailing zeros gives the shortest
+     * form; otherwise 16 or 17 digits are needed. Subnormals have fewer bits
+     * and are searched digit by digit. */
+    for (precision = subnormal ? 1 : 15; precision < 17; precision++) {
+        snprintf(digits, sizeof digits, "%.*e", precision - 1, d);
+        if (strtod(digits, NULL) == d)
+            break;
+    }
+    snprintf(digits, sizeof digits, "%.*e", precision - 1, d);
+    e = strchr(digits, 'e');
+    exponent = atoi(e + 1);
+    if (precision == 15 && !subnormal) {
+        while (e[-1] == '0')
+            e--, precision--;
+        snprintf(digits, sizeof digits, "%.*e", precision - 1, d);
+    }
+    if (exponent < -4 || exponent >= 16) {
+        fputs(digits, stdout);
+    } else {
+        /* Same digits in positional form, e.g. 1.5e+02 -> 150 */
+        decimals = precision - 1 - exponent;
+        printf("%.*f%s", decimals > 0 ? decimals : 0, d, decimals > 0 ? "" : ".0");
+    }
+    fputs(end, stdout);
+}
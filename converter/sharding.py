@@ -0,0 +1,243 @@
+"""Split a batch conversion across independent processes or machines.
+
+A manifest is a text file listing one input per line, relative to the
+manifest's directory (blank lines and lines starting with '#' are
+skipped). Every shard hashes the whole manifest and computes the same
+plan on its own, so no coordinator is needed. Each shard converts its
+part into an output directory and writes shard-K-of-N.json there.
+merge_shards() checks those files against the plan and assembles one
+output tree.
+"""
+import hashlib
+import heapq
+import json
+import os
+import shutil
+import time
+from .pipeline import TARGET_EXTENSIONS, detect_input_language, parse_source, generate_output
+
+RESULTS_VERSION = 1
+
+
+def parse_shard(text):
+    """Parse 'K/N' (1 <= K <= N) into (K, N)"""
+    try:
+        k, n = (int(part) for part in text.split('/'))
+    except ValueError:
+        raise ValueError(f"shard must look like K/N, got {text!r}") from None
+    if not 1 <= k <= n:
+        raise ValueError(f"shard {text} is out of range; K must be between 1 and N")
+    return k, n
+
+
+def read_manifest(path):
+    """Return the input paths listed in a manifest file"""
+    inputs = []
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            name = os.path.normpath(line)
+            if os.path.isabs(name) or name.split(os.sep)[0] == '..':
+                raise ValueError(f"manifest entries must stay inside the manifest's directory: {line}")
+            detect_input_language(name)
+            inputs.append(name)
+    if len(set(inputs)) != len(inputs):
+        raise ValueError("manifest lists the same input more than once")
+    return inputs
+
+
+def _sha256_file(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def hash_inputs(base, inputs):
+    """Return (path, sha256, size) for each input"""
+    return [(name, _sha256_file(os.path.join(base, name)), os.path.getsize(os.path.join(base, name)))
+            for name in inputs]
+
+
+def manifest_digest(entries):
+    """Fingerprint of the manifest's paths and contents, independent of line order"""
+    digest = hashlib.sha256()
+    for name, sha, size in sorted(entries):
+        digest.update(f"{name}\0{sha}\0{size}\n".encode())
+    return digest.hexdigest()
+
+
+def plan_shards(entries, shards):
+    """Assign each (path, sha256, size) entry to one of `shards` shards.
+
+    Largest inputs are placed first, each on the least loaded shard
+    (longest-processing-time scheduling, with bytes standing in for time).
+    Ties are broken by content hash and then path, so the plan depends only
+    on the inputs and never on manifest order or the host.
+    """
+    plan = [[] for _ in range(shards)]
+    loads = [(0, index) for index in range(shards)]
+    for name, sha, size in sorted(entries, key=lambda e: (-e[2], e[1], e[0])):
+        load, index = heapq.heappop(loads)
+        plan[index].append(name)
+        heapq.heappush(loads, (load + max(size, 1), index))
+    return plan
+
+
+def output_paths_for(name, target_langs=None):
+    """Relative output path for each target of one input"""
+    lang = detect_input_language(name)
+    targets = target_langs or ['python' if lang == 'c' else 'c']
+    stem = os.path.splitext(name)[0]
+    return {target: stem + TARGET_EXTENSIONS[target] for target in targets}
+
+
+def _overwritten_inputs(base, inputs, output_files):
+    """Inputs (relative to base) that one of output_files would overwrite"""
+    outputs = {os.path.abspath(path) for path in output_files}
+    return [name for name in inputs if os.path.abspath(os.path.join(base, name)) in outputs]
+
+
+def shard_results_path(output_dir, shard, shards):
+    return os.path.join(output_dir, f"shard-{shard}-of-{shards}.json")
+
+
+def run_shard(manifest_path, shard, shards, output_dir, target_langs=None, c_parser='fast',
+              jobs=1, log=None, buffered_output=True):
+    """Convert this shard's inputs into output_dir and write its results file.
+
+    Returns the results dict; failed conversions are recorded rather than raised.
+    """
+    start = time.perf_counter()
+    base = os.path.dirname(os.path.abspath(manifest_path))
+    inputs = read_manifest(manifest_path)
+    # Checked across the whole manifest, since another shard's input is just as easy to clobber
+    clobbered = _overwritten_inputs(base, inputs, (os.path.join(output_dir, rel) for name in inputs
+                                                   for rel in output_paths_for(name, target_langs).values()))
+    if clobbered:
+        raise ValueError(f"an output file would overwrite the input file {clobbered[0]}")
+    entries = hash_inputs(base, inputs)
+    by_name = {name: (sha, size) for name, sha, size in entries}
+    results = []
+    for name in sorted(plan_shards(entries, shards)[shard - 1]):
+        sha, size = by_name[name]
+        result = {'input': name, 'sha256': sha, 'bytes': size, 'outputs': {}, 'status': 'ok'}
+        convert_start = time.perf_counter()
+        try:
+            with open(os.path.join(base, name)) as f:
+                code = f.read()
+            ast = parse_source(code, detect_input_language(name), jobs=jobs, c_parser=c_parser)
+            for target, rel in output_paths_for(name, target_langs).items():
+                generated = generate_output(ast, target, jobs=jobs, buffered_output=buffered_output)
+                path = os.path.join(output_dir, rel)
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                with open(path, 'w') as out_f:
+                    out_f.write(generated)
+                result['outputs'][target] = {'path': rel, 'sha256': hashlib.sha256(generated.encode()).hexdigest()}
+        except Exception as e:
+            result.update(status='error', error=f"{type(e).__name__}: {e}")
+        result['time'] = time.perf_counter() - convert_start
+        results.append(result)
+        if log:
+            log(f"[{shard}/{shards}] {name}: {result['status']}")
+    data = {
+        'version': RESULTS_VERSION,
+        'shard': shard,
+        'shards': shards,
+        'manifest_digest': manifest_digest(entries),
+        'results': results,
+        'bytes': sum(r['bytes'] for r in results),
+        'wall_time': time.perf_counter() - start,
+    }
+    os.makedirs(output_dir, exist_ok=True)
+    with open(shard_results_path(output_dir, shard, shards), 'w') as f:
+        json.dump(data, f, indent=2)
+    return data
+
+
+def merge_shards(manifest_path, shard_files, output_dir, log=None):
+    """Combine shard results into output_dir and return a list of problems.
+
+    Checks that all N shards are present, were planned from the current
+    manifest, and that every input was converted exactly once, by the shard
+    it was assigned to, with intact outputs that no other input also wrote.
+    On success it writes manifest.json to output_dir and returns [].
+    """
+    base = os.path.dirname(os.path.abspath(manifest_path))
+    entries = hash_inputs(base, read_manifest(manifest_path))
+    digest = manifest_digest(entries)
+    problems = []
+    shard_data = []
+    for path in shard_files:
+        try:
+            with open(path) as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            problems.append(f"{path}: cannot read shard results ({type(e).__name__}: {e})")
+            continue
+        data['_dir'] = os.path.dirname(os.path.abspath(path))
+        shard_data.append(data)
+    if not shard_data:
+        return problems
+    counts = {data['shards'] for data in shard_data}
+    if len(counts) != 1:
+        return problems + [f"shard files disagree on the shard count: {sorted(counts)}"]
+    shards = counts.pop()
+    seen_shards = sorted(data['shard'] for data in shard_data)
+    missing = sorted(set(range(1, shards + 1)) - set(seen_shards))
+    if missing:
+        problems.append(f"missing shard(s): {', '.join(map(str, missing))}")
+    for k in sorted({k for k in seen_shards if seen_shards.count(k) > 1}):
+        problems.append(f"shard {k} appears more than once")
+    for data in shard_data:
+        if data['manifest_digest'] != digest:
+            problems.append(f"shard {data['shard']} was run against a different manifest or different inputs")
+
+    plan = {name: index + 1 for index, names in enumerate(plan_shards(entries, shards)) for name in names}
+    produced = {}   # input -> shard numbers that converted it
+    writers = {}    # output path -> input that wrote it
+    copies = []
+    for data in shard_data:
+        for result in data['results']:
+            name = result['input']
+            produced.setdefault(name, []).append(data['shard'])
+            if name not in plan:
+                problems.append(f"{name}: not in the manifest (shard {data['shard']})")
+                continue
+            if plan[name] != data['shard']:
+                problems.append(f"{name}: converted by shard {data['shard']} but planned for shard {plan[name]}")
+            if result['status'] != 'ok':
+                problems.append(f"{name}: {result.get('error', result['status'])}")
+            for output in result['outputs'].values():
+                rel = output['path']
+                if rel in writers and writers[rel] != name:
+                    problems.append(f"{rel}: written by both {writers[rel]} and {name}")
+                writers[rel] = name
+                source = os.path.join(data['_dir'], rel)
+                if not os.path.exists(source) or _sha256_file(source) != output['sha256']:
+                    problems.append(f"{rel}: missing or modified since shard {data['shard']} wrote it")
+                else:
+                    copies.append((source, os.path.join(output_dir, rel)))
+    for name in sorted(plan):
+        count = len(produced.get(name, []))
+        if count != 1 and plan[name] in seen_shards:
+            problems.append(f"{name}: converted {count} times, expected exactly once")
+    for name in _overwritten_inputs(base, plan, (target for _, target in copies)):
+        problems.append(f"{name}: merging would overwrite this input")
+    if problems:
+        return problems
+
+    for source, target in copies:
+        if os.path.abspath(source) != os.path.abspath(target):
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            shutil.copyfile(source, target)
+    results = sorted((r for data in shard_data for r in data['results']), key=lambda r: r['input'])
+    with open(os.path.join(output_dir, 'manifest.json'), 'w') as f:
+        json.dump({'version': RESULTS_VERSION, 'shards': shards, 'manifest_digest': digest,
+                   'results': results}, f, indent=2)
+    if log:
+        log(f"Merged {len(results)} inputs from {shards} shard(s) into {output_dir}")
+    return []
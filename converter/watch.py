@@ -0,0 +1,388 @@
+"""Watch source files and reconvert them as they change.
+
+Changes come from inotify on Linux and from polling elsewhere. A burst of
+save events is coalesced into one round, only the files that changed are
+converted, and every round reuses the calling thread's warm parsers.
+"""
+import ctypes
+import ctypes.util
+import os
+import select
+import statistics
+import struct
+import sys
+import time
+from .pipeline import (TARGET_EXTENSIONS, detect_input_language, output_paths,
+                       parse_source, generate_output)
+
+SOURCE_EXTENSIONS = ('.c', '.py')
+
+# inotify(7) event bits
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+_WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+_EVENT = struct.Struct('iIII')  # wd, mask, cookie, len; the name follows
+
+
+def _is_source(name):
+    return os.path.splitext(name)[1].lower() in SOURCE_EXTENSIONS
+
+
+def _skip_dir(name):
+    return name.startswith('.') or name == '__pycache__'
+
+
+def _stamp(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def _walk_sources(root):
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [d for d in dirnames if not _skip_dir(d)]
+        for name in filenames:
+            if _is_source(name):
+                yield os.path.join(dirpath, name)
+
+
+def _libc():
+    if not sys.platform.startswith('linux'):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+    except OSError:
+        return None
+    return libc if hasattr(libc, 'inotify_init1') else None
+
+
+class InotifyWatcher:
+    """Watches files and directory trees with inotify.
+
+    Each event names the file that changed, so an edit never triggers a
+    rescan. Single files are watched through their parent directory because
+    editors often save by renaming a temporary file over the original.
+    """
+
+    def __init__(self, roots):
+        libc = _libc()
+        if libc is None:
+            raise OSError("inotify is not available")
+        fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._libc, self._fd = libc, fd
+        self._roots = [os.path.abspath(root) for root in roots]
+        self._dirs = {}          # watch descriptor -> directory
+        self._recursive = set()  # descriptors for directories inside a watched tree
+        self._files = set()      # single files watched through their parent
+        try:
+            for root in self._roots:
+                if os.path.isdir(root):
+                    self._add_tree(root)
+                else:
+                    self._files.add(root)
+                    self._add_watch(os.path.dirname(root))
+        except OSError:
+            self.close()
+            raise
+
+    def _add_watch(self, directory):
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(directory), _WATCH_MASK)
+        if wd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, f"cannot watch {directory}: {os.strerror(errno)}")
+        self._dirs[wd] = directory
+        return wd
+
+    def _add_tree(self, root):
+        for dirpath, dirnames, _ in os.walk(root):
+            dirnames[:] = [d for d in dirnames if not _skip_dir(d)]
+            try:
+                self._recursive.add(self._add_watch(dirpath))
+            except OSError:
+                if dirpath == root:
+                    raise
+                dirnames[:] = []  # removed while we were walking
+
+    def poll(self, timeout):
+        """Wait up to `timeout` seconds and return the set of changed source paths"""
+        changed = set()
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        while ready:
+            try:
+                data = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, length = _EVENT.unpack_from(data, offset)
+                start = offset + _EVENT.size
+                name = os.fsdecode(data[start:start + length].rstrip(b'\0'))
+                offset = start + length
+                self._handle(wd, mask, name, changed)
+        return changed
+
+    def _handle(self, wd, mask, name, changed):
+        if mask & IN_Q_OVERFLOW:
+            # The kernel dropped events; this is the one case that rescans
+            for root in self._roots:
+                changed.update(_walk_sources(root) if os.path.isdir(root) else [root])
+            return
+        if mask & IN_IGNORED:
+            self._dirs.pop(wd, None)
+            self._recursive.discard(wd)
+            return
+        directory = self._dirs.get(wd)
+        if directory is None:
+            return
+        path = os.path.join(directory, name)
+        if mask & IN_ISDIR:
+            if wd in self._recursive and not _skip_dir(name):
+                self._add_tree(path)
+                changed.update(_walk_sources(path))  # files that arrived with the directory
+        elif mask & (IN_CLOSE_WRITE | IN_MOVED_TO):
+            if path in self._files or (wd in self._recursive and _is_source(name)):
+                changed.add(path)
+
+    def close(self):
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+class PollingWatcher:
+    """Finds changes by stat()ing the known source files every `interval` seconds.
+
+    A directory is only listed again when its own mtime changes, which
+    happens when an entry is added, removed or renamed, so an edit costs one
+    stat per watched file rather than a walk of the tree.
+    """
+
+    def __init__(self, roots, interval=0.2):
+        self.interval = interval
+        self._files = {}  # path -> (mtime_ns, size), or None while missing
+        self._dirs = {}   # path -> mtime_ns
+        for root in map(os.path.abspath, roots):
+            if os.path.isdir(root):
+                self._dirs[root] = os.stat(root).st_mtime_ns
+                self._scan_dir(root, None)
+            else:
+                self._files[root] = _stamp(root)
+
+    def _scan_dir(self, directory, changed):
+        try:
+            entries = list(os.scandir(directory))
+        except OSError:
+            return
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                stamp = _stamp(entry.path)
+                if stamp and entry.path not in self._dirs and not _skip_dir(entry.name):
+                    self._dirs[entry.path] = stamp[0]
+                    self._scan_dir(entry.path, changed)
+            elif _is_source(entry.name) and entry.path not in self._files:
+                self._files[entry.path] = _stamp(entry.path)
+                if changed is not None:
+                    changed.add(entry.path)
+
+    def _check(self):
+        changed = set()
+        for directory, mtime in list(self._dirs.items()):
+            stamp = _stamp(directory)
+            if stamp is None:
+                del self._dirs[directory]
+            elif stamp[0] != mtime:
+                self._dirs[directory] = stamp[0]
+                self._scan_dir(directory, changed)
+        for path, old in list(self._files.items()):
+            stamp = _stamp(path)
+            if stamp != old:
+                self._files[path] = stamp
+                if stamp is not None:
+                    changed.add(path)
+        return changed
+
+    def poll(self, timeout):
+        """Wait up to `timeout` seconds and return the set of changed source paths"""
+        deadline = time.monotonic() + timeout
+        while True:
+            changed = self._check()
+            remaining = deadline - time.monotonic()
+            if changed or remaining <= 0:
+                return changed
+            time.sleep(min(self.interval, remaining))
+
+    def close(self):
+        pass
+
+
+def open_watcher(roots, polling=False, interval=0.2):
+    """Return an InotifyWatcher where the platform supports it, else a PollingWatcher"""
+    if not polling:
+        try:
+            return InotifyWatcher(roots)
+        except OSError:
+            pass
+    return PollingWatcher(roots, interval)
+
+
+def collect_changes(watcher, timeout, debounce=0.05, max_delay=1.0):
+    """Wait up to `timeout` for a change, then keep collecting until nothing
+    changes for `debounce` seconds.
+
+    An editor save or a `git checkout` produces a burst of events; this turns
+    the burst into one round. `max_delay` bounds how long a continuous stream
+    of events can postpone the round.
+    """
+    changed = watcher.poll(timeout)
+    if not changed:
+        return changed
+    start = time.monotonic()
+    while time.monotonic() - start < max_delay:
+        more = watcher.poll(debounce)
+        if not more:
+            break
+        changed |= more
+    return changed
+
+
+class WatchSession:
+    """Converts a source file, or every source file under a directory, as it changes.
+
+    For a directory, outputs mirror the tree under `output`, which must lie
+    outside the watched directory so the outputs are not picked up as new
+    sources.
+    """
+
+    def __init__(self, input_path, output, target_langs=None, c_parser='fast', jobs=1,
+                 polling=False, interval=0.2, debounce=0.05, log=print, buffered_output=True):
+        self.input_path = os.path.abspath(input_path)
+        self.is_dir = os.path.isdir(self.input_path)
+        if not output:
+            raise ValueError("--output is required with --watch")
+        self.output = os.path.abspath(output)
+        if self.is_dir:
+            if os.path.commonpath([self.input_path, self.output]) == self.input_path:
+                raise ValueError("with a watched directory, --output must be a directory outside it")
+        else:
+            detect_input_language(self.input_path)
+        self.target_langs = target_langs
+        if not self.is_dir and self.input_path in map(os.path.abspath, self.outputs_for(self.input_path).values()):
+            # The session would keep reconverting its own output
+            raise ValueError("an output file would overwrite the input file")
+        self.c_parser = c_parser
+        self.jobs = jobs
+        self.buffered_output = buffered_output
+        self.debounce = debounce
+        self.log = log
+        self.latencies = []
+        self.watcher = open_watcher([self.input_path], polling, interval)
+
+    def outputs_for(self, source):
+        """Map each target language to the output file for `source`"""
+        lang = detect_input_language(source)
+        targets = self.target_langs or ['python' if lang == 'c' else 'c']
+        if not self.is_dir:
+            return output_paths(self.output, targets)
+        stem = os.path.splitext(os.path.relpath(source, self.input_path))[0]
+        return {target: os.path.join(self.output, stem + TARGET_EXTENSIONS[target]) for target in targets}
+
+    def sources(self):
+        return sorted(_walk_sources(self.input_path)) if self.is_dir else [self.input_path]
+
+    def convert_file(self, source, track_latency=True):
+        """Convert one source to all of its outputs and return a result dict.
+
+        Latency runs from the source's mtime, i.e. when it was saved, to when
+        the last output was written.
+        """
+        result = {'source': source, 'outputs': [], 'error': None}
+        try:
+            saved_ns = os.stat(source).st_mtime_ns
+            start = time.perf_counter()
+            with open(source) as f:
+                code = f.read()
+            ast = parse_source(code, detect_input_language(source), jobs=self.jobs, c_parser=self.c_parser)
+            for target, path in self.outputs_for(source).items():
+                generated = generate_output(ast, target, jobs=self.jobs, buffered_output=self.buffered_output)
+                os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+                with open(path, 'w') as out_f:
+                    out_f.write(generated)
+                result['outputs'].append(path)
+        except FileNotFoundError:
+            return None  # deleted before we got to it
+        except Exception as e:
+            # A half-edited file must not end the session
+            result['error'] = f"{type(e).__name__}: {e}"
+            return result
+        result['convert_time'] = time.perf_counter() - start
+        result['latency'] = None
+        if track_latency:
+            result['latency'] = max(0, time.time_ns() - saved_ns) / 1e9
+            self.latencies.append(result['latency'])
+        return result
+
+    def _report(self, result):
+        name = os.path.relpath(result['source'])
+        if result['error']:
+            self.log(f"{name}: {result['error']}")
+        else:
+            outputs = ', '.join(map(os.path.relpath, result['outputs']))
+            line = f"{name} → {outputs} in {result['convert_time'] * 1000:.1f} ms"
+            if result['latency'] is not None:
+                line += f" ({result['latency'] * 1000:.1f} ms after save)"
+            self.log(line)
+
+    def convert_stale(self):
+        """Convert sources whose outputs are missing or older than the source"""
+        results = []
+        for source in self.sources():
+            stamp = _stamp(source)
+            outputs = [_stamp(path) for path in self.outputs_for(source).values()]
+            if stamp and any(out is None or out[0] < stamp[0] for out in outputs):
+                result = self.convert_file(source, track_latency=False)
+                if result:
+                    self._report(result)
+                    results.append(result)
+        return results
+
+    def step(self, timeout=1.0):
+        """Wait for one round of changes, convert them and return the results"""
+        results = []
+        for source in sorted(collect_changes(self.watcher, timeout, self.debounce)):
+            result = self.convert_file(source)
+            if result:
+                self._report(result)
+                results.append(result)
+        return results
+
+    def summary(self):
+        if not self.latencies:
+            return "No files converted."
+        return (f"{len(self.latencies)} conversion(s); save → output latency "
+                f"median {statistics.median(self.latencies) * 1000:.1f} ms, "
+                f"max {max(self.latencies) * 1000:.1f} ms")
+
+    def run(self):
+        """Convert stale outputs, then watch until interrupted"""
+        kind = 'inotify' if isinstance(self.watcher, InotifyWatcher) else 'polling'
+        self.convert_stale()
+        self.log(f"Watching {os.path.relpath(self.input_path)} ({kind}); press Ctrl-C to stop")
+        try:
+            while True:
+                self.step()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.close()
+        self.log(self.summary())
+
+    def close(self):
+        self.watcher.close()
@@ -1,66 +1,148 @@
 import argparse
 import os
-from parser.c_parser import CParser
-from parser.python_parser import PythonParser
-from converter.ast_transformer import ASTTransformer
-from converter.python_generator import generate_python
-from converter.c_generator import generate_c
-
-def detect_input_language(filename):
-    """Detect input language based on file extension"""
-    ext = os.path.splitext(filename)[1].lower()
-    if ext == '.c':
-        return 'c'
-    elif ext == '.py':
-        return 'python'
-    else:
-        raise ValueError(f"Unsupported file extension: {ext}")
+import sys
+from converter.profiling import Profiler
+from converter.ir_format import dump_ir
+from converter.parallel import default_workers
+from converter.watch import WatchSession
+from converter.sharding import parse_shard, run_shard, merge_shards
+from converter.pipeline import (profile_stage, parse_source, load_intermediate, generate_output,
+                                verify_roundtrip, detect_input_language, output_paths)
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Bidirectional C ↔ Python Code Converter")
-    parser.add_argument("input", help="Input file (.c or .py)")
-    parser.add_argument("--target", choices=["python", "c"], help="Target language (auto-detected if not specified)")
-    parser.add_argument("--output", help="Output file", required=True)
+    parser.add_argument("input", help="Input file (.c or .py, or an IR file with --from-ir)")
+    parser.add_argument("--target", nargs="+", choices=["python", "c"],
+                        help="Target language(s) (auto-detected if not specified)")
+    parser.add_argument("--output", help="Output file (with several targets, the stem for each target's file)")
+    parser.add_argument("--verify-roundtrip", action="store_true",
+                        help="Parse each output back and report differences from the source IR")
+    parser.add_argument("--emit-ir", metavar="PATH", help="Also write the parsed intermediate AST to PATH")
+    parser.add_argument("--from-ir", action="store_true", help="Read the input as an IR file written by --emit-ir")
+    parser.add_argument("--c-parser", choices=["fast", "pycparser"], default="fast",
+                        help="C parser: the fast subset parser (falls back to pycparser) or always pycparser")
+    parser.add_argument("--no-buffered-output", dest="buffered_output", action="store_false",
+                        help="In C output, keep default stdout buffering even when printing inside loops")
+    parser.add_argument("--jobs", type=int, default=1, metavar="N",
+                        help="Generate top-level functions (and transform them, for C read by pycparser) "
+                             "on N processes (0 = all cores)")
+    parser.add_argument("--watch", action="store_true",
+                        help="Keep running and reconvert the input (a file or directory) whenever it changes")
+    parser.add_argument("--poll", action="store_true", help="With --watch, poll for changes instead of using inotify")
+    parser.add_argument("--debounce", type=float, default=50, metavar="MS",
+                        help="With --watch, wait for MS milliseconds of quiet before converting a burst of saves")
+    parser.add_argument("--shard", metavar="K/N",
+                        help="Treat the input as a manifest of files and convert shard K of N into the --output directory")
+    parser.add_argument("--merge", nargs="+", metavar="RESULTS",
+                        help="Combine shard-K-of-N.json results for the input manifest into the --output directory")
+    parser.add_argument("--profile", action="store_true", help="Report time, memory and node counts per stage")
+    parser.add_argument("--profile-format", choices=["text", "json"], default="text", help="Profile report format")
+    parser.add_argument("--profile-output", help="Write the profile report to this file instead of stdout")
     args = parser.parse_args()
 
-    # Detect input and target languages
-    input_lang = detect_input_language(args.input)
-    
+    if not args.output and not args.emit_ir:
+        parser.error("--output is required unless --emit-ir is given")
+    if args.from_ir and args.emit_ir:
+        parser.error("--emit-ir cannot be combined with --from-ir")
+
+    profiler = Profiler() if args.profile else None
+    jobs = args.jobs if args.jobs > 0 else default_workers()
+
+    if args.shard or args.merge:
+        if args.shard and args.merge:
+            parser.error("--shard and --merge are separate steps")
+        if not args.output:
+            parser.error("--output directory is required with --shard and --merge")
+        if args.from_ir or args.emit_ir or args.watch or args.verify_roundtrip or args.profile:
+            parser.error("--shard and --merge cannot be combined with IR, watch, round-trip or profiling options")
+        try:
+            if args.shard:
+                shard, shards = parse_shard(args.shard)
+                data = run_shard(args.input, shard, shards, args.output,
+                                 args.target and list(dict.fromkeys(args.target)), args.c_parser, jobs, log=print,
+                                 buffered_output=args.buffered_output)
+                failed = [r for r in data['results'] if r['status'] != 'ok']
+                print(f"Shard {shard}/{shards}: {len(data['results']) - len(failed)} converted, "
+                      f"{len(failed)} failed, {data['bytes']} bytes in {data['wall_time']:.2f} s")
+                sys.exit(1 if failed else 0)
+            problems = merge_shards(args.input, args.merge, args.output, log=print)
+        except ValueError as e:
+            parser.error(str(e))
+        for problem in problems:
+            print(f"MERGE ERROR {problem}")
+        sys.exit(1 if problems else 0)
+
+    if args.watch:
+        if args.from_ir or args.emit_ir or args.verify_roundtrip or args.profile:
+            parser.error("--watch cannot be combined with IR, round-trip or profiling options")
+        try:
+            session = WatchSession(args.input, args.output, args.target and list(dict.fromkeys(args.target)),
+                                   args.c_parser, jobs, polling=args.poll, debounce=args.debounce / 1000,
+                                   buffered_output=args.buffered_output)
+        except ValueError as e:
+            parser.error(str(e))
+        session.run()
+        sys.exit(0)
+
+    if args.from_ir:
+        intermediate_ast, input_lang = load_intermediate(args.input, profiler)
+        if not input_lang and not args.target:
+            parser.error("IR file does not record its source language; pass --target")
+    else:
+        # Detect input language
+        input_lang = detect_input_language(args.input)
+
     if args.target:
-        target_lang = args.target
+        target_langs = list(dict.fromkeys(args.target))
     else:
         # Auto-detect target based on input
-        target_lang = 'python' if input_lang == 'c' else 'c'
+        target_langs = ['python' if input_lang == 'c' else 'c']
+    outputs = output_paths(args.output, target_langs) if args.output else {}
+    if os.path.abspath(args.input) in map(os.path.abspath, outputs.values()):
+        parser.error("an output file would overwrite the input file")
 
-    print(f"Input file: {args.input} ({input_lang})")
-    print(f"Target language: {target_lang}")
-    print(f"Output file: {args.output}")
+    print(f"Input file: {args.input} ({'ir' if args.from_ir else input_lang})")
+    print(f"Target language: {', '.join(target_langs)}")
+    for output in outputs.values():
+        print(f"Output file: {output}")
 
-    # Read input file
-    with open(args.input) as f:
-        input_code = f.read()
+    if not args.from_ir:
+        # Read input file
+        with open(args.input) as f:
+            input_code = f.read()
+        intermediate_ast = parse_source(input_code, input_lang, profiler, jobs, args.c_parser)
 
-    # Parse based on input language
-    if input_lang == 'c':
-        parser_obj = CParser()
-        source_ast = parser_obj.parse(input_code)
-        transformer = ASTTransformer()
-        intermediate_ast = transformer.transform(source_ast)
-    else:  # python
-        parser_obj = PythonParser()
-        intermediate_ast = parser_obj.parse(input_code)
+    if args.emit_ir:
+        with profile_stage(profiler, 'emit_ir'):
+            dump_ir(intermediate_ast, args.emit_ir, input_lang)
+        print(f"IR written to {args.emit_ir}")
 
-    # Generate output based on target language
-    if target_lang == "python":
-        output_code = generate_python(intermediate_ast)
-    elif target_lang == "c":
-        output_code = generate_c(intermediate_ast)
-    else:
-        raise ValueError(f"Unsupported target language: {target_lang}")
+    # Every target is generated from the same parse
+    for target_lang, output in outputs.items():
+        stage_name = 'generate' if len(outputs) == 1 else f'generate:{target_lang}'
+        output_code = generate_output(intermediate_ast, target_lang, profiler, stage_name, jobs,
+                                      args.buffered_output)
+
+        # Write output
+        with open(output, "w") as out_f:
+            out_f.write(output_code)
+
+        print(f"Conversion complete! {(input_lang or 'ir').upper()} → {target_lang.upper()}")
+        print(f"Output written to {output}")
+
+        if args.verify_roundtrip:
+            differences = verify_roundtrip(intermediate_ast, output_code, target_lang, profiler)
+            if differences:
+                print(f"Round-trip {target_lang}: {len(differences)} difference(s) from the source IR")
+                for difference in differences[:10]:
+                    print(f"  {difference}")
+            else:
+                print(f"Round-trip {target_lang}: identical to the source IR")
 
-    # Write output
-    with open(args.output, "w") as out_f:
-        out_f.write(output_code)
-    
-    print(f"Conversion complete! {input_lang.upper()} → {target_lang.upper()}")
-    print(f"Output written to {args.output}") 
\ No newline at end of file
+    if profiler:
+        report = profiler.report(args.profile_format)
+        if args.profile_output:
+            with open(args.profile_output, "w") as report_f:
+                report_f.write(report + "\n")
+        else:
+            print(report)
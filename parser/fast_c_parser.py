@@ -0,0 +1,401 @@
+"""Recursive-descent parser for the C subset the converter understands.
+
+It builds our intermediate AST directly instead of a full pycparser tree,
+and produces exactly what CParser + ASTTransformer produce for the same
+input, including their current gaps (e.g. an `i++` statement is dropped).
+Whenever it meets something it can't reproduce faithfully it raises
+UnsupportedSyntax and the caller falls back to pycparser.
+"""
+import re
+from converter.ast_nodes import (Program, VarDecl, Assignment, Print, If, While, For,
+                                Function, FunctionCall, Return, Array, ArrayAccess,
+                                Pointer, Dereference, AddressOf)
+
+class UnsupportedSyntax(Exception):
+    """The input uses C outside the fast parser's subset"""
+
+_TOKEN_RE = re.compile(r'''
+    (?P<skip>\s+|//[^\n]*|/\*.*?\*/)
+  | (?P<num>(?:0[xX][0-9a-fA-F]+|(?:\d+\.\d*|\.\d+)(?:[eE][+-]?\d+)?|\d+[eE][+-]?\d+|\d+)[uUlLfF]*(?![\w.]))
+  | (?P<char>'(?:[^'\\\n]|\\.)+')
+  | (?P<str>"(?:[^"\\\n]|\\.)*")
+  | (?P<id>[A-Za-z_]\w*)
+  | (?P<op><<=|>>=|\+\+|--|<<|>>|&&|\|\||[-+*/%&|^!<>=]=?|[~(){}\[\];,])
+''', re.S | re.X)
+
+_BASE_TYPES = {'void', 'char', 'short', 'int', 'long', 'float', 'double', 'signed', 'unsigned', '_Bool'}
+_SPECIFIERS = {'static', 'extern', 'const', 'volatile', 'register', 'inline', 'auto'}
+# Keywords outside the subset; seeing one sends the whole file to pycparser
+_UNSUPPORTED = {'struct', 'union', 'enum', 'typedef', 'switch', 'case', 'default', 'do',
+                'goto', 'sizeof', 'restrict', '_Alignas', '_Alignof', '_Atomic', '_Complex',
+                '_Generic', '_Imaginary', '_Noreturn', '_Static_assert', '_Thread_local'}
+
+_KEYWORDS = _BASE_TYPES | _SPECIFIERS | _UNSUPPORTED | {
+    'if', 'else', 'while', 'for', 'return', 'break', 'continue'}
+
+_BINARY_PRECEDENCE = {
+    '||': 1, '&&': 2, '|': 3, '^': 4, '&': 5,
+    '==': 6, '!=': 6, '<': 7, '>': 7, '<=': 7, '>=': 7,
+    '<<': 8, '>>': 8, '+': 9, '-': 9, '*': 10, '/': 10, '%': 10,
+}
+_ASSIGN_OPS = {'=', '+=', '-=', '*=', '/=', '%=', '&=', '|=', '^=', '<<=', '>>='}
+_PREFIX_OPS = {'-', '+', '!', '~', '*', '&', '++', '--'}
+
+# Expression tree entries: (kind, ...) tuples
+_CONST, _ID, _BIN, _UNARY, _INDEX, _CALL, _ASSIGN = range(7)
+
+def _tokenize(code):
+    tokens = []
+    pos = 0
+    end = len(code)
+    match = _TOKEN_RE.match
+    while pos < end:
+        m = match(code, pos)
+        if not m:
+            raise UnsupportedSyntax(f"unexpected character {code[pos]!r} at offset {pos}")
+        kind = m.lastgroup
+        if kind != 'skip':
+            text = m.group()
+            if kind == 'num' and re.match(r'0\d*[89]', text) and not re.search(r'[.eE]', text):
+                raise UnsupportedSyntax(f"invalid octal constant {text}")
+            tokens.append((kind, text))
+        pos = m.end()
+    tokens.append(('eof', '#eof'))
+    return tokens
+
+class FastCParser:
+    """Parse the supported C subset straight into our intermediate AST"""
+
+    def parse(self, code):
+        self._tokens = _tokenize(code)
+        self._pos = 0
+        statements = []
+        while self._peek() != '#eof':
+            stmt = self._external()
+            if stmt:
+                statements.append(stmt)
+        return Program(statements)
+
+    # -- token helpers -------------------------------------------------
+
+    def _peek(self):
+        """Text of the next operator or word; '#kind' for literals and end of input"""
+        kind, text = self._tokens[self._pos]
+        return text if kind in ('op', 'id', 'eof') else '#' + kind
+
+    def _next(self):
+        token = self._tokens[self._pos]
+        if token[0] != 'eof':
+            self._pos += 1
+        return token
+
+    def _expect(self, text):
+        kind, actual = self._next()
+        if actual != text or kind not in ('op', 'id'):
+            raise UnsupportedSyntax(f"expected {text!r}, found {actual!r}")
+
+    def _accept(self, text):
+        if self._peek() == text:
+            self._pos += 1
+            return True
+        return False
+
+    def _identifier(self):
+        kind, text = self._next()
+        if kind != 'id' or text in _KEYWORDS:
+            raise UnsupportedSyntax(f"expected an identifier, found {text!r}")
+        return text
+
+    # -- declarations --------------------------------------------------
+
+    def _starts_declaration(self):
+        word = self._peek()
+        return word in _BASE_TYPES or word in _SPECIFIERS
+
+    def _specifiers(self):
+        """Read storage classes, qualifiers and base type words; return the type string"""
+        names = []
+        while True:
+            word = self._peek()
+            if word in _BASE_TYPES:
+                if word in names and word != 'long':
+                    raise UnsupportedSyntax(f"repeated type specifier {word}")
+                names.append(word)
+            elif word not in _SPECIFIERS:
+                break
+            self._pos += 1
+        if not names:
+            raise UnsupportedSyntax("declaration without a base type")
+        return ' '.join(names)
+
+    def _stars(self):
+        count = 0
+        while self._accept('*'):
+            count += 1
+            if self._peek() in _SPECIFIERS:
+                raise UnsupportedSyntax("qualified pointer")
+        return count
+
+    def _external(self):
+        if not self._starts_declaration():
+            raise UnsupportedSyntax(f"unsupported top-level construct at {self._peek()!r}")
+        base = self._specifiers()
+        stars = self._stars()
+        name = self._identifier()
+        if self._peek() == '(':
+            return self._function(base, stars, name)
+        return self._declaration_rest(base, stars, name)
+
+    def _function(self, base, stars, name):
+        params = self._parameters()
+        if self._peek() != '{':
+            raise UnsupportedSyntax(f"prototype or K&R definition of {name}")
+        body = [s for s in self._compound() if s]
+        return Function(name, params, base + '*' * stars, body)
+
+    def _parameters(self):
+        self._expect('(')
+        params = []
+        if self._accept(')'):
+            return params
+        while True:
+            base = self._specifiers()
+            stars = self._stars()
+            # unnamed parameters, as in f(void), are skipped by the transformer
+            if self._peek() not in (',', ')'):
+                params.append((base + '*' * stars, self._identifier()))
+            if self._peek() == '[':
+                raise UnsupportedSyntax("array parameter")
+            if self._accept(')'):
+                return params
+            self._expect(',')
+
+    def _declaration_rest(self, base, stars, name):
+        if self._accept('['):
+            size = None
+            if not self._accept(']'):
+                size = self._convert(self._expression(allow_assign=False))
+                self._expect(']')
+            if self._peek() in ('[', '='):
+                raise UnsupportedSyntax("multi-dimensional or initialized array")
+            self._expect(';')
+            return Array(name, size, base + '*' * stars, None)
+        value = None
+        if self._accept('='):
+            if self._peek() == '{':
+                raise UnsupportedSyntax("initializer list")
+            value = self._convert(self._expression(allow_assign=True))
+        if self._peek() == ',':
+            raise UnsupportedSyntax("several declarators in one declaration")
+        self._expect(';')
+        if stars:
+            return Pointer(name, base + '*' * (stars - 1), value)
+        return VarDecl(base, name, value)
+
+    def _local_declaration(self):
+        base = self._specifiers()
+        stars = self._stars()
+        return self._declaration_rest(base, stars, self._identifier())
+
+    # -- statements ----------------------------------------------------
+
+    def _compound(self):
+        """Parse a braced block and return its transformed items (None included)"""
+        self._expect('{')
+        items = []
+        while not self._accept('}'):
+            if self._peek() == '#eof':
+                raise UnsupportedSyntax("unterminated block")
+            items.append(self._statement())
+        return items
+
+    def _braced_body(self, what):
+        if self._peek() != '{':
+            raise UnsupportedSyntax(f"{what} body without braces")
+        return self._compound()
+
+    def _statement(self):
+        word = self._peek()
+        if word in _UNSUPPORTED:
+            raise UnsupportedSyntax(f"unsupported keyword {word}")
+        if self._starts_declaration():
+            return self._local_declaration()
+        if word == 'if':
+            self._pos += 1
+            condition = self._parenthesized()
+            then_body = self._braced_body('if')
+            else_body = []
+            if self._accept('else'):
+                else_body = self._braced_body('else')
+            return If(condition, then_body, else_body if else_body else None)
+        if word == 'while':
+            self._pos += 1
+            condition = self._parenthesized()
+            return While(condition, self._braced_body('while'))
+        if word == 'for':
+            return self._for()
+        if word == 'return':
+            self._pos += 1
+            value = None
+            if not self._accept(';'):
+                value = self._convert(self._expression(allow_assign=True))
+                self._expect(';')
+            return Return(value)
+        if word in ('break', 'continue'):
+            self._pos += 1
+            self._expect(';')
+            return None
+        if word == ';':
+            self._pos += 1
+            return None
+        if word == '{':
+            self._compound()  # a bare block is not mapped by the transformer
+            return None
+        expr = self._expression(allow_assign=True)
+        self._expect(';')
+        return self._statement_from(expr)
+
+    def _parenthesized(self):
+        self._expect('(')
+        expr = self._expression(allow_assign=True)
+        self._expect(')')
+        return self._convert(expr)
+
+    def _for(self):
+        self._pos += 1
+        self._expect('(')
+        if self._starts_declaration():
+            raise UnsupportedSyntax("declaration in for initializer")
+        init = condition = increment = None
+        if not self._accept(';'):
+            init = self._statement_from(self._expression(allow_assign=True))
+            self._expect(';')
+        if not self._accept(';'):
+            condition = self._convert(self._expression(allow_assign=True))
+            self._expect(';')
+        if not self._accept(')'):
+            increment = self._statement_from(self._expression(allow_assign=True))
+            self._expect(')')
+        return For(init, condition, increment, self._braced_body('for'))
+
+    def _statement_from(self, expr):
+        """Mirror ASTTransformer._transform_node for an expression statement"""
+        kind = expr[0]
+        if kind == _ASSIGN:
+            return Assignment(self._convert(expr[2]), self._convert(expr[3]))
+        if kind == _CALL:
+            name, args = expr[1], expr[2]
+            if name == 'printf':
+                if args:
+                    if len(args) > 1 and args[0][0] == _CONST and args[0][2]:
+                        return Print(self._convert(args[1]))
+                    return Print(self._convert(args[0]))
+                return None
+            if name == 'cc_print_double' and args:
+                return Print(self._convert(args[0]))
+            return FunctionCall(name, [self._convert(a) for a in args])
+        return None
+
+    # -- expressions ---------------------------------------------------
+
+    def _expression(self, allow_assign):
+        left = self._binary(1)
+        op = self._peek()
+        if op in _ASSIGN_OPS:
+            if not allow_assign:
+                raise UnsupportedSyntax("assignment in this position")
+            self._pos += 1
+            return (_ASSIGN, op, left, self._expression(allow_assign))
+        return left
+
+    def _binary(self, min_precedence):
+        left = self._unary()
+        while True:
+            op = self._peek()
+            precedence = _BINARY_PRECEDENCE.get(op)
+            if precedence is None or precedence < min_precedence:
+                return left
+            self._pos += 1
+            right = self._binary(precedence + 1)
+            left = (_BIN, op, left, right)
+
+    def _unary(self):
+        kind, text = self._tokens[self._pos]
+        if kind == 'op' and text in _PREFIX_OPS:
+            self._pos += 1
+            return (_UNARY, text, self._unary())
+        return self._postfix(self._primary())
+
+    def _primary(self):
+        kind, text = self._next()
+        if kind == 'num' or kind == 'char':
+            return (_CONST, text, False)
+        if kind == 'str':
+            if self._tokens[self._pos][0] == 'str':
+                raise UnsupportedSyntax("adjacent string literals")
+            return (_CONST, text, True)
+        if kind == 'id':
+            if text in _KEYWORDS:
+                raise UnsupportedSyntax(f"unexpected keyword {text}")
+            return (_ID, text)
+        if text == '(':
+            if self._starts_declaration():
+                raise UnsupportedSyntax("cast")
+            expr = self._expression(allow_assign=True)
+            self._expect(')')
+            return expr
+        raise UnsupportedSyntax(f"unexpected token {text!r}")
+
+    def _postfix(self, expr):
+        while True:
+            op = self._peek()
+            if op == '[':
+                self._pos += 1
+                index = self._expression(allow_assign=True)
+                self._expect(']')
+                expr = (_INDEX, expr, index)
+            elif op == '(':
+                if expr[0] != _ID:
+                    raise UnsupportedSyntax("call through an expression")
+                self._pos += 1
+                args = []
+                if not self._accept(')'):
+                    while True:
+                        args.append(self._expression(allow_assign=True))
+                        if self._accept(')'):
+                            break
+                        self._expect(',')
+                expr = (_CALL, expr[1], args)
+            elif op in ('++', '--'):
+                self._pos += 1
+                expr = (_UNARY, 'p' + op, expr)
+            elif op in ('.', '->'):
+                raise UnsupportedSyntax("struct member access")
+            else:
+                return expr
+
+    def _convert(self, expr):
+        """Mirror ASTTransformer._transform_expr"""
+        kind = expr[0]
+        if kind == _CONST:
+            return expr[1]
+        if kind == _ID:
+            return expr[1]
+        if kind == _BIN:
+            left = self._convert(expr[2])
+            right = self._convert(expr[3])
+            if not (left is None or isinstance(left, str)) or not (right is None or isinstance(right, str)):
+                # the transformer would embed an object repr here
+                raise UnsupportedSyntax("call, index or pointer operand inside a binary expression")
+            return f"{left} {expr[1]} {right}"
+        if kind == _INDEX:
+            return ArrayAccess(self._convert(expr[1]), self._convert(expr[2]))
+        if kind == _UNARY:
+            if expr[1] == '*':
+                return Dereference(self._convert(expr[2]))
+            if expr[1] == '&':
+                return AddressOf(self._convert(expr[2]))
+            raise UnsupportedSyntax(f"unary {expr[1]} in an expression")
+        if kind == _CALL:
+            return FunctionCall(expr[1], [self._convert(a) for a in expr[2]])
+        raise UnsupportedSyntax("nested assignment")
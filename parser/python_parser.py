@@ -1,6 +1,7 @@
 import ast
-from converter.ast_nodes import (Program, VarDecl, Assignment, Print, If, While, For,
-                                Function, FunctionCall, Return, Array, ArrayAccess)
+from converter.ast_nodes import (ASTNode, Program, VarDecl, Assignment, Print, If, While, For,
+                                Function, FunctionCall, Return, Array, ArrayAccess, Pointer,
+                                BinaryOp, List, ListAppend, ListAssign, ListLength, ListAccess)
 
 class PythonParser:
     """Parser for converting Python AST to our intermediate AST"""
@@ -9,16 +10,40 @@ class PythonParser:
         """Parse Python code and return our intermediate AST"""
         try:
             python_ast = ast.parse(python_code)
-            statements = []
-            
-            for node in python_ast.body:
-                stmt = self._transform_python_node(node)
-                if stmt:
-                    statements.append(stmt)
-            
-            return Program(statements)
         except SyntaxError as e:
             raise ValueError(f"Invalid Python syntax: {e}")
+        # Names bound in each enclosing block: name -> List node for lists,
+        # the C type name for everything else. Functions start a fresh local scope.
+        self._scopes = [{}]
+        self._function_depth = 0
+        return Program(self._transform_body(python_ast.body, new_scope=False))
+
+    def _transform_body(self, nodes, new_scope=True, names=None):
+        if new_scope:
+            self._scopes.append(dict(names or {}))
+        body = []
+        for node in nodes:
+            transformed = self._transform_python_node(node)
+            if transformed:
+                body.append(transformed)
+        if new_scope:
+            self._scopes.pop()
+        return body
+
+    def _lookup(self, name):
+        """What `name` is bound to in the current function (or the module), if anything"""
+        for scope in reversed(self._scopes[self._function_depth:]):
+            if name in scope:
+                return scope[name]
+        return self._scopes[0].get(name)
+
+    def _list_named(self, expr):
+        """The List node that a Name expression refers to, if it is a known list"""
+        if isinstance(expr, ast.Name):
+            bound = self._lookup(expr.id)
+            if isinstance(bound, List):
+                return bound
+        return None
     
     def _transform_python_node(self, node):
         """Transform a Python AST node to our intermediate representation"""
@@ -26,10 +51,27 @@ class PythonParser:
             # Handle assignments like x = 5
             if len(node.targets) == 1 and isinstance(node.targets[0], ast.Name):
                 var_name = node.targets[0].id
+                rebinding = any(var_name in scope for scope in self._scopes[self._function_depth:])
+                if isinstance(node.value, ast.List):
+                    values = [self._transform_python_expr(item) for item in node.value.elts]
+                    bound = self._lookup(var_name)
+                    if rebinding and isinstance(bound, List):
+                        # The list keeps its C element type, as a rebound scalar keeps its type
+                        if not bound.values and bound.element_type == 'int':
+                            bound.element_type = self._infer_element_type(node.value.elts)
+                        return ListAssign(var_name, values)
+                    declaration = List(var_name, self._infer_element_type(node.value.elts), values)
+                    self._scopes[-1][var_name] = declaration
+                    return declaration
                 value = self._transform_python_expr(node.value)
-                # Determine if this is a declaration or assignment
-                # For simplicity, treat as VarDecl with type inference
-                return VarDecl('int', var_name, value)
+                # Rebinding a name this function already declared is a plain assignment
+                if rebinding:
+                    return Assignment(var_name, value)
+                var_type = self._infer_value_type(node.value)
+                self._scopes[-1][var_name] = var_type
+                if var_type == 'char*':
+                    return Pointer(var_name, 'char', value)  # as C's `char* s = "..."` parses
+                return VarDecl(var_type, var_name, value)
             elif len(node.targets) == 1 and isinstance(node.targets[0], ast.Subscript):
                 # Array assignment like arr[0] = 5
                 target = self._transform_python_expr(node.targets[0])
@@ -38,16 +80,22 @@ class PythonParser:
         
         elif isinstance(node, ast.Expr):
             # Handle expression statements (like function calls)
-            return self._transform_python_expr(node.value)
+            call = node.value
+            if (isinstance(call, ast.Call) and isinstance(call.func, ast.Attribute)
+                    and call.func.attr == 'append' and len(call.args) == 1):
+                target = self._list_named(call.func.value)
+                if target is not None:
+                    if not target.values and target.element_type == 'int':
+                        target.element_type = self._infer_element_type(call.args)  # first evidence of the type
+                    return ListAppend(target.name, self._transform_python_expr(call.args[0]))
+            return self._transform_python_expr(call)
         
         elif isinstance(node, ast.FunctionDef):
             # Handle function definitions
             params = [(self._infer_type(arg.arg), arg.arg) for arg in node.args.args]
-            body = []
-            for stmt in node.body:
-                transformed = self._transform_python_node(stmt)
-                if transformed:
-                    body.append(transformed)
+            outer_depth, self._function_depth = self._function_depth, len(self._scopes)
+            body = self._transform_body(node.body, names={name: param_type for param_type, name in params})
+            self._function_depth = outer_depth
             return Function(node.name, params, 'int', body)  # Default return type
         
         elif isinstance(node, ast.Return):
@@ -56,27 +104,14 @@ class PythonParser:
         
         elif isinstance(node, ast.If):
             condition = self._transform_python_expr(node.test)
-            then_body = []
-            for stmt in node.body:
-                transformed = self._transform_python_node(stmt)
-                if transformed:
-                    then_body.append(transformed)
-            
-            else_body = []
-            for stmt in node.orelse:
-                transformed = self._transform_python_node(stmt)
-                if transformed:
-                    else_body.append(transformed)
-            
+            then_body = self._transform_body(node.body)
+            else_body = self._transform_body(node.orelse)
+
             return If(condition, then_body, else_body if else_body else None)
         
         elif isinstance(node, ast.While):
             condition = self._transform_python_expr(node.test)
-            body = []
-            for stmt in node.body:
-                transformed = self._transform_python_node(stmt)
-                if transformed:
-                    body.append(transformed)
+            body = self._transform_body(node.body)
             return While(condition, body)
         
         return None
@@ -84,6 +119,8 @@ class PythonParser:
     def _transform_python_expr(self, expr):
         """Transform Python expressions"""
         if isinstance(expr, ast.Constant):
+            if isinstance(expr.value, str):
+                return _quote(expr.value)  # same form as C string literals in our AST
             return expr.value
         elif isinstance(expr, ast.Name):
             return expr.id
@@ -91,15 +128,28 @@ class PythonParser:
             left = self._transform_python_expr(expr.left)
             right = self._transform_python_expr(expr.right)
             op = self._get_operator(expr.op)
-            return f"{left} {op} {right}"
+            if isinstance(expr.op, ast.Div) and 'double' not in {self._infer_value_type(expr.left),
+                                                                 self._infer_value_type(expr.right)}:
+                # Python's / is true division; in C two ints would divide as ints
+                left = self._binary('1.0', '*', _parenthesize(left))
+                right = _parenthesize(right)
+            return self._binary(left, op, right)
+        elif isinstance(expr, ast.UnaryOp) and isinstance(expr.op, ast.USub):
+            # Negative numbers and negated names, e.g. the index in xs[-1]
+            operand = self._transform_python_expr(expr.operand)
+            if not isinstance(operand, ASTNode):
+                return f"-{operand}"
         elif isinstance(expr, ast.Compare):
             left = self._transform_python_expr(expr.left)
             # Handle single comparison for simplicity
             if len(expr.ops) == 1 and len(expr.comparators) == 1:
                 op = self._get_compare_op(expr.ops[0])
                 right = self._transform_python_expr(expr.comparators[0])
-                return f"{left} {op} {right}"
+                return self._binary(left, op, right)
         elif isinstance(expr, ast.Call):
+            if (isinstance(expr.func, ast.Name) and expr.func.id == 'len' and len(expr.args) == 1
+                    and self._list_named(expr.args[0]) is not None):
+                return ListLength(expr.args[0].id)
             func_name = self._transform_python_expr(expr.func)
             if func_name == 'print':
                 # Convert print to our Print node
@@ -113,6 +163,8 @@ class PythonParser:
             # Array access like arr[0]
             array_name = self._transform_python_expr(expr.value)
             index = self._transform_python_expr(expr.slice)
+            if self._list_named(expr.value) is not None:
+                return ListAccess(array_name, index)
             return ArrayAccess(array_name, index)
         elif isinstance(expr, ast.List):
             # Python list -> Array initialization
@@ -121,6 +173,41 @@ class PythonParser:
         
         return str(expr)
     
+    def _binary(self, left, op, right):
+        """Plain operands become a string like "a + b"; node operands need a BinaryOp"""
+        if isinstance(left, ASTNode) or isinstance(right, ASTNode):
+            return BinaryOp(left, op, right)
+        return f"{left} {op} {right}"
+
+    def _infer_element_type(self, elements):
+        """'double' if any element is a float, 'char*' if all are strings, otherwise 'int'"""
+        element_types = {self._infer_value_type(e) for e in elements}
+        if 'double' in element_types:
+            return 'double'
+        return 'char*' if element_types == {'char*'} else 'int'
+
+    def _infer_value_type(self, expr):
+        """C type for a variable initialized from expr: int, double or char*"""
+        if isinstance(expr, ast.Constant):
+            if isinstance(expr.value, float):
+                return 'double'
+            return 'char*' if isinstance(expr.value, str) else 'int'
+        if isinstance(expr, ast.Name):
+            bound = self._lookup(expr.id)
+            return bound if isinstance(bound, str) else 'int'
+        if isinstance(expr, ast.BinOp):
+            if isinstance(expr.op, ast.Div):
+                return 'double'  # true division, even of two ints
+            operand_types = {self._infer_value_type(expr.left), self._infer_value_type(expr.right)}
+            return 'double' if 'double' in operand_types else 'int'
+        if isinstance(expr, ast.UnaryOp):
+            return self._infer_value_type(expr.operand)
+        if isinstance(expr, ast.Subscript):
+            target = self._list_named(expr.value)
+            if target is not None:
+                return target.element_type
+        return 'int'
+
     def _get_operator(self, op):
         """Convert Python AST operators to string"""
         if isinstance(op, ast.Add):
@@ -156,3 +243,27 @@ class PythonParser:
         # For now, default to int
         # In a more sophisticated version, you could analyze usage
         return 'int'
+
+
+def _parenthesize(operand):
+    """Wrap a compound operand kept as text, such as "a + 1", in parentheses"""
+    if isinstance(operand, str) and ' ' in operand and not operand.startswith('"'):
+        return f"({operand})"
+    return operand
+
+
+def _quote(text):
+    """A string literal that reads the same in C and Python"""
+    escaped = []
+    for ch in text:
+        if ch in '\\"':
+            escaped.append('\\' + ch)
+        elif ch == '\n':
+            escaped.append('\\n')
+        elif ch == '\t':
+            escaped.append('\\t')
+        elif ord(ch) < 32 or ord(ch) == 127:
+            escaped.append(f'\\{ord(ch):03o}')
+        else:
+            escaped.append(ch)
+    return '"' + ''.join(escaped) + '"'
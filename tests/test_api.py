@@ -0,0 +1,66 @@
+import sys, os, asyncio, threading
+import pytest
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from concurrent.futures import ThreadPoolExecutor
+from benchmarks.corpus import CorpusConfig, generate_source
+from converter import api
+from converter.api import convert, convert_async, ConverterPool, ConversionOptions, QueueFullError
+
+def _c_program(n):
+    return f'int main() {{ int a = {n}; printf("%d", a); return 0; }}'
+
+def test_convert_defaults_target():
+    assert 'a = 5' in convert(_c_program(5), 'c')
+    assert 'int x = 1;' in convert('x = 1\n', 'python')
+    with pytest.raises(ValueError):
+        convert('x', 'rust')
+
+def test_concurrent_threads_get_correct_results():
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(lambda n: convert(_c_program(n), 'c', 'python'), range(64)))
+    for n, code in enumerate(results):
+        assert f'a = {n}\n' in code
+
+def test_concurrent_parallel_conversions():
+    # Each call's process pool must see only its own source
+    sources = [generate_source('c', CorpusConfig(function_count=4, seed=n)) for n in range(4)]
+    options = ConversionOptions(jobs=2, c_parser='pycparser')
+    expected = [convert(source, 'c', 'python') for source in sources]
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        results = list(pool.map(lambda source: convert(source, 'c', 'python', options), sources * 2))
+    assert results == expected * 2
+
+def test_convert_async():
+    async def run():
+        return await asyncio.gather(*(convert_async(_c_program(n), 'c') for n in range(10)))
+    for n, code in enumerate(asyncio.run(run())):
+        assert f'a = {n}\n' in code
+
+def _blocking_convert(release):
+    def fake_convert(source, input_lang, target_lang=None, options=None):
+        release.wait(5)
+        return 'done'
+    return fake_convert
+
+def test_backpressure(monkeypatch):
+    release = threading.Event()
+    monkeypatch.setattr(api, 'convert', _blocking_convert(release))
+    with ConverterPool(max_workers=1, max_pending=2) as pool:
+        first = pool.submit('', 'c')
+        second = pool.submit('', 'c')
+        with pytest.raises(QueueFullError):
+            pool.submit('', 'c')
+        release.set()
+        assert first.result() == second.result() == 'done'
+        assert pool.submit('', 'c').result() == 'done'  # slots are freed again
+
+def test_timeouts(monkeypatch):
+    release = threading.Event()
+    monkeypatch.setattr(api, 'convert', _blocking_convert(release))
+    options = ConversionOptions(timeout=0.05)
+    with ConverterPool(max_workers=1) as pool:
+        with pytest.raises(TimeoutError):
+            pool.convert('', 'c', options=options)
+        with pytest.raises(asyncio.TimeoutError):
+            asyncio.run(pool.convert_async('', 'c', options=options))
+        release.set()
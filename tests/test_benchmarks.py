@@ -0,0 +1,42 @@
+import sys, os, ast
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from benchmarks.corpus import CorpusConfig, generate_source, generate_to_size, parse_size
+from benchmarks.bench import run_benchmarks, compare_results
+from parser.c_parser import CParser
+
+def test_generated_sources_parse():
+    config = CorpusConfig(function_count=3, nesting_depth=3, expression_length=5, array_size=4)
+    c_code = generate_source('c', config)
+    file_ast = CParser().parse(c_code)
+    assert len(file_ast.ext) == 4  # three functions plus main
+    py_code = generate_source('python', config)
+    assert len(ast.parse(py_code).body) == 4
+    assert generate_source('c', config) == c_code  # deterministic for a given seed
+
+def test_generate_to_size():
+    assert parse_size('1KB') == 1024
+    assert parse_size('2MB') == 2 * 1024 * 1024
+    source = generate_to_size('c', parse_size('20KB'))
+    assert 15 * 1024 < len(source) < 25 * 1024
+
+def test_run_and_compare():
+    data = run_benchmarks(['1KB', '4KB'], langs=['c'], repeat=1, c_parser='pycparser')
+    assert [row['size'] for row in data['results']] == ['1KB', '4KB']
+    assert set(data['results'][0]['stages']) == {'parse', 'transform', 'generate'}
+    assert 'c' in data['scaling']
+    assert compare_results(data, data) == []
+
+    slower = {'results': [dict(row, stages={name: dict(m, wall_time=m['wall_time'] * 3 + 0.01)
+                                            for name, m in row['stages'].items()})
+                          for row in data['results']]}
+    regressions = compare_results(data, slower, threshold=0.5)
+    assert {r['stage'] for r in regressions} == {'parse', 'transform', 'generate'}
+
+def run_all():
+    test_generated_sources_parse()
+    test_generate_to_size()
+    test_run_and_compare()
+    print('All benchmark tests passed!')
+
+if __name__ == "__main__":
+    run_all()
@@ -0,0 +1,171 @@
+import sys, os, subprocess, tempfile
+import pytest
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from parser.python_parser import PythonParser
+from converter.ast_nodes import (Program, VarDecl, Print, Function, Array, ArrayAccess,
+                                 Pointer, Dereference, FunctionCall)
+from converter.c_generator import generate_c, generate_c_body, STDOUT_BUFFERING
+from converter.parallel import generate_parallel
+from converter.pipeline import parse_source, verify_roundtrip
+from converter.sharding import run_shard
+from converter.watch import WatchSession
+from benchmarks.differential import find_compiler
+from benchmarks.printing import run_print_benchmark
+
+PY_CODE = '''
+def half(n):
+    return n / 2
+
+def main():
+    name = "world"
+    x = 2.5
+    xs = [0.1, 0.2]
+    i = 0
+    while i < 3:
+        print(i)
+        print(x * i)
+        i = i + 1
+    print(name)
+    print("done")
+    print(xs[1])
+    print(len(xs))
+    print(xs)
+    print(0.1 + 0.2)
+    print(x - 0.5)
+    return 0
+'''
+
+def _print_lines(program):
+    return [line.strip() for line in generate_c_body(program).split('\n')
+            if line.strip().startswith(('printf(', 'cc_print_double(', 'cc_list_print'))]
+
+def test_formats_follow_types():
+    assert _print_lines(PythonParser().parse(PY_CODE)) == [
+        'printf("%d\\n", i);',
+        'cc_print_double(x * i, "\\n");',
+        'printf("%s\\n", name);',
+        'printf("%s\\n", "done");',
+        'cc_print_double(cc_list_at(xs, 1), "\\n");',
+        'printf("%d\\n", cc_list_len(xs));',
+        'cc_list_print_doubles(xs);',
+        'cc_print_double(0.1 + 0.2, "\\n");',
+        'cc_print_double(x - 0.5, "\\n");',
+    ]
+
+def test_true_division_is_double():
+    code = generate_c(PythonParser().parse('def main():\n    a = 1\n    x = 7 / 2\n    y = (a + 3) / 2\n'
+                                           '    print(x)\n    return 0\n'))
+    assert 'double x = 1.0 * 7 / 2;' in code and 'double y = 1.0 * (a + 3) / 2;' in code
+    assert 'cc_print_double(x, "\\n");' in code
+
+def test_formats_for_c_declarations():
+    program = Program([
+        Function('ratio', [('double', 'a')], 'double', [VarDecl('long', 'n', '3')]),
+        Function('main', [], 'int', [
+            VarDecl('unsigned long', 'n', '3'),
+            VarDecl('char', 'c', "'a'"),
+            Array('vals', '4', 'float'),
+            Pointer('p', 'int', '&n'),
+            Print('n + 1'), Print('c'), Print(ArrayAccess('vals', '0')),
+            Print(Dereference('p')), Print('p'), Print(FunctionCall('ratio', ['1.0'])),
+            Print('n < 2'), Print('unknown'),
+        ]),
+    ])
+    assert _print_lines(program) == [
+        'printf("%lu\\n", n + 1);',
+        'printf("%c\\n", c);',
+        'printf("%.7g\\n", vals[0]);',
+        'printf("%d\\n", *p);',
+        'printf("%p\\n", (void *)(p));',
+        'cc_print_double(ratio(1.0), "\\n");',
+        'printf("%d\\n", n < 2);',
+        'printf("%d\\n", unknown);',  # the converter's default type is int
+    ]
+
+def test_buffering_only_for_prints_in_loops():
+    program = PythonParser().parse(PY_CODE)
+    code = generate_c(program)
+    assert '#include <stdio.h>' in code
+    setup = '\n    '.join(STDOUT_BUFFERING)
+    assert code.count(setup) == 1
+    assert code.index('int main() {') < code.index(setup)
+    assert 'setvbuf' not in generate_c(program, buffered_output=False)
+    straight = PythonParser().parse('def main():\n    print(1)\n    return 0\n')
+    assert 'setvbuf' not in generate_c(straight)
+    assert generate_parallel(program, 'c', workers=2, chunk_size=1) == code
+
+def test_watch_and_shards_honour_buffering(tmp_path):
+    (tmp_path / 'loop.py').write_text(PY_CODE)
+    (tmp_path / 'inputs.txt').write_text('loop.py\n')
+    run_shard(str(tmp_path / 'inputs.txt'), 1, 1, str(tmp_path / 'shard'), buffered_output=False)
+    session = WatchSession(str(tmp_path / 'loop.py'), str(tmp_path / 'watched.c'), polling=True,
+                           buffered_output=False)
+    session.convert_file(str(tmp_path / 'loop.py'))
+    session.close()
+    for output in (tmp_path / 'shard' / 'loop.c', tmp_path / 'watched.c'):
+        assert 'printf' in output.read_text() and 'setvbuf' not in output.read_text()
+
+def test_roundtrip_ignores_generated_setup():
+    program = PythonParser().parse(PY_CODE.replace('xs = [0.1, 0.2]', 'y = 1').replace('xs[1]', 'y')
+                                   .replace('len(xs)', 'y').replace('    print(xs)\n', ''))
+    assert verify_roundtrip(program, generate_c(program), 'c') == []
+
+def test_c_source_keeps_its_types():
+    ast = parse_source('int main() { double d = 1.5; int k = 2; printf("%f", d); printf("%d", k); return 0; }', 'c')
+    assert _print_lines(ast) == ['cc_print_double(d, "\\n");', 'printf("%d\\n", k);']
+    assert 'cc_print' not in generate_c(parse_source('int main() { int k = 2; printf("%d", k); return 0; }', 'c'))
+
+@pytest.mark.skipif(find_compiler() is None, reason="no C compiler available")
+def test_compiled_output_matches_python():
+    from contextlib import redirect_stdout
+    from io import StringIO
+    namespace, expected = {}, StringIO()
+    exec(PY_CODE, namespace)
+    with redirect_stdout(expected):
+        namespace['main']()
+    with tempfile.TemporaryDirectory() as tmp:
+        source, binary = os.path.join(tmp, 'prog.c'), os.path.join(tmp, 'prog')
+        with open(source, 'w') as f:
+            f.write(generate_c(PythonParser().parse(PY_CODE)))
+        subprocess.run([find_compiler(), '-std=c99', '-Wall', '-Werror', source, '-o', binary], check=True)
+        actual = subprocess.run([binary], capture_output=True, text=True).stdout
+    assert actual == expected.getvalue()
+
+@pytest.mark.skipif(find_compiler() is None, reason="no C compiler available")
+def test_doubles_print_like_python_repr():
+    values = [0.0, -0.0, 2.0, 0.1, 0.1 + 0.2, 1 / 3, -2.5, 123456789.0, 1e15, 1e16, 1.5e16, 1e-4, 1e-5,
+              5e-324, 2.2250738585072014e-308, 1.7976931348623157e308, 99.99999999999999, 1e22]
+    calls = ''.join(f'    cc_print_double({v.hex()}, "\\n");\n' for v in values)
+    runtime = os.path.join(os.path.dirname(__file__), '..', 'converter', 'runtime', 'cc_print.h')
+    with tempfile.TemporaryDirectory() as tmp:
+        source, binary = os.path.join(tmp, 'repr.c'), os.path.join(tmp, 'repr')
+        with open(source, 'w') as f:
+            f.write(f'#include "{os.path.abspath(runtime)}"\nint main(void) {{\n{calls}    return 0;\n}}\n')
+        subprocess.run([find_compiler(), '-std=c99', '-Wall', '-Werror', source, '-o', binary], check=True)
+        actual = subprocess.run([binary], capture_output=True, text=True).stdout
+    assert actual.split('\n')[:-1] == [repr(v) for v in values]
+
+@pytest.mark.skipif(find_compiler() is None, reason="no C compiler available")
+def test_print_benchmark():
+    data = run_print_benchmark(lines=200, repeat=1)
+    assert {row['program'] for row in data['results']} == {'ints', 'doubles', 'list'}
+    assert all(row['same_output'] and row['lines'] >= 200 for row in data['results'])
+
+def run_all():
+    test_formats_follow_types()
+    test_true_division_is_double()
+    test_formats_for_c_declarations()
+    test_buffering_only_for_prints_in_loops()
+    with tempfile.TemporaryDirectory() as tmp:
+        import pathlib
+        test_watch_and_shards_honour_buffering(pathlib.Path(tmp))
+    test_roundtrip_ignores_generated_setup()
+    test_c_source_keeps_its_types()
+    if find_compiler():
+        test_compiled_output_matches_python()
+        test_doubles_print_like_python_repr()
+        test_print_benchmark()
+    print('All C printing tests passed!')
+
+if __name__ == "__main__":
+    run_all()
@@ -75,11 +75,32 @@ def test_for():
     assert 'while a < 3:' in py_code
     assert 'a = a + 1' in py_code
 
+def test_function_bodies_and_types():
+    c_code = '''
+    int add(int a, char* b) {
+        double d = 1.5;
+        return a;
+    }
+    int main(void) {
+        return add(1, 0);
+    }
+    '''
+    py_code = run_conversion(c_code)
+    if DEBUG:
+        print('test_function_bodies_and_types output:')
+        print(py_code)
+    assert 'def add(a, b):\n    d = 1.5\n    return a' in py_code
+    assert 'def main():' in py_code
+    ast = ASTTransformer().transform(CParser().parse(c_code))
+    assert ast.statements[0].params == [('int', 'a'), ('char*', 'b')]
+    assert ast.statements[0].body[0].var_type == 'double'
+
 def run_all():
     test_var_decl_and_assignment()
     test_if_else()
     test_while()
     test_for()
+    test_function_bodies_and_types()
     print('All tests passed!')
 
 if __name__ == "__main__":
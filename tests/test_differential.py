@@ -0,0 +1,34 @@
+import sys, os
+import pytest
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from benchmarks.differential import run_harness, corpus_programs, find_compiler
+
+pytestmark = pytest.mark.skipif(find_compiler() is None, reason="no C compiler available")
+
+def _programs(*names):
+    return [p for p in corpus_programs() if os.path.splitext(os.path.basename(p))[0] in names]
+
+def test_matching_program():
+    report = run_harness(_programs('arithmetic'), repeat=1)
+    record = report['programs'][0]
+    assert record['status'] == 'ok'
+    assert record['c_time'] > 0 and record['ratio'] > 0
+    assert 'status' in record['roundtrip_c']
+    assert report['summary'] == {'ok': 1}
+
+def test_mismatch_is_reported():
+    # C integer division becomes Python true division
+    report = run_harness(_programs('division'), repeat=1)
+    record = report['programs'][0]
+    assert record['status'] == 'mismatch'
+    assert record['expected'] == '3\n'
+    assert record['actual'] == '3.5\n'
+
+def test_failing_original_is_reported(tmp_path):
+    (tmp_path / 'fails.c').write_text('int main() { printf("%d\\n", 1); return 3; }\n')
+    (tmp_path / 'hangs.c').write_text('int main() { while (1) { } return 0; }\n')
+    report = run_harness([str(tmp_path / 'fails.c'), str(tmp_path / 'hangs.c')], repeat=1, timeout=1)
+    fails, hangs = report['programs']
+    assert fails['status'] == 'original_error' and fails['returncode'] == 3
+    assert hangs['status'] == 'original_timeout'
+    assert report['summary'] == {'original_error': 1, 'original_timeout': 1}
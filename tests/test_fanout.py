@@ -0,0 +1,47 @@
+import sys, os, subprocess, tempfile
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from converter.ast_nodes import Program, VarDecl, Assignment, While
+from converter.ir_diff import diff_ir
+from converter.pipeline import parse_source, generate_output, verify_roundtrip
+from main import output_paths
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+C_CODE = '''
+int main() {
+    int a = 7;
+    int b = a * 2;
+    printf("%d", b);
+    return 0;
+}
+'''
+
+def test_diff_ir():
+    a = Program([VarDecl('int', 'x', '5'), While('x < 3', [Assignment('x', 'x + 1')])])
+    same = Program([VarDecl('int', 'x', 5), While('x < 3', [Assignment('x', 'x + 1')])])
+    assert diff_ir(a, same) == []
+    changed = Program([VarDecl('double', 'x', '5'), While('x < 3', [])])
+    assert diff_ir(a, changed) == ["program.statements[0].var_type: 'int' != 'double'",
+                                   "program.statements[1].body: length 1 != 0"]
+
+def test_verify_roundtrip():
+    ast = parse_source(C_CODE, 'c')
+    assert verify_roundtrip(ast, generate_output(ast, 'c'), 'c') == []
+    assert verify_roundtrip(ast, 'def main(:\n', 'python')[0].startswith('generated python does not parse')
+
+def test_output_paths():
+    assert output_paths('out.py', ['python']) == {'python': 'out.py'}
+    assert output_paths('build/prog.py', ['python', 'c']) == {'python': 'build/prog.py', 'c': 'build/prog.c'}
+
+def test_cli_fan_out():
+    with tempfile.TemporaryDirectory() as tmp:
+        source = os.path.join(tmp, 'prog.c')
+        with open(source, 'w') as f:
+            f.write(C_CODE)
+        os.mkdir(os.path.join(tmp, 'out'))
+        result = subprocess.run([sys.executable, os.path.join(ROOT, 'main.py'), source,
+                                 '--target', 'python', 'c', '--output', os.path.join(tmp, 'out', 'prog'),
+                                 '--verify-roundtrip'], capture_output=True, text=True, cwd=tmp)
+        assert result.returncode == 0, result.stderr
+        assert sorted(os.listdir(os.path.join(tmp, 'out'))) == ['prog.c', 'prog.py']
+        assert 'Round-trip c: identical to the source IR' in result.stdout
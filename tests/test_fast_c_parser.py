@@ -0,0 +1,95 @@
+import sys, os, glob
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from parser.c_parser import CParser
+from parser.fast_c_parser import FastCParser, UnsupportedSyntax
+from converter.ast_nodes import ASTNode
+from converter.ast_transformer import ASTTransformer
+from converter.pipeline import parse_source
+from benchmarks.corpus import CorpusConfig, generate_source
+from benchmarks.bench import compare_parsers
+
+PROGRAMS = os.path.join(os.path.dirname(__file__), '..', 'benchmarks', 'programs')
+
+SUPPORTED = [
+    'int g = 5; double h; int main(void) { return g; }',
+    'unsigned long long f(int* p, char c) { *p = 3; return *p; }',
+    'int main() { int i; for (i = 0; i < 10; i++) { if (i == 3) { break; } continue; } ; { int z; } return 1; }',
+    'int main() { int x = 1; x += 4; x++; --x; return x; }',
+    'int main() { int *a[3]; int **pp; int arr[]; a[0] = &arr[1]; pp = &a[0]; return 0; }',
+    'int main() { printf("hi\\n"); printf("%d %d", 1, 2); foo(1, x, "s"); return f(g(1)); }',
+    'int main() { for (;;) { } while (1) { } if (x) { } else { } return 0; }',
+    'static const int k = 0x1Fu; float f = 1.5e3f; char c = \'\\n\'; int main() { return (k + 1) * 2; }',
+    'int main() { if (a && b || c ^ d << 2) { x = a[b][c]; } return 0; }',
+]
+
+UNSUPPORTED = [
+    'struct s { int a; }; int main() { return 0; }',
+    'int main() { int x = (int) 3.5; return x ? 1 : 0; }',
+    'int main() { return fib(n-1) + fib(n-2); }',
+    'int main() { int x = 1, y = 2; return x; }',
+    'int main() { if (x) return 1; return 0; }',
+    'int main() { if (x) { } else if (y) { } return 0; }',
+    '#include <stdio.h>\nint main() { return 0; }',
+    'int main() { int a[3] = {1,2,3}; }',
+    'int main() { return 1 }',  # syntax errors are left to pycparser to report
+]
+
+def assert_same(expected, actual, path='program'):
+    """Stricter than diff_ir: types and values must match exactly, not just their str()"""
+    if isinstance(expected, ASTNode) or isinstance(actual, ASTNode):
+        assert type(expected) is type(actual), path
+        assert vars(expected).keys() == vars(actual).keys(), path
+        for key in vars(expected):
+            assert_same(getattr(expected, key), getattr(actual, key), f'{path}.{key}')
+    elif isinstance(expected, (list, tuple)):
+        assert type(expected) is type(actual) and len(expected) == len(actual), path
+        for i, (a, b) in enumerate(zip(expected, actual)):
+            assert_same(a, b, f'{path}[{i}]')
+    else:
+        assert type(expected) is type(actual) and expected == actual, (path, expected, actual)
+
+def reference(code):
+    return ASTTransformer().transform(CParser().parse(code))
+
+def test_matches_pycparser():
+    sources = list(SUPPORTED)
+    sources += [generate_source('c', CorpusConfig(function_count=4, nesting_depth=depth, seed=seed))
+                for depth in range(4) for seed in range(2)]
+    for code in sources:
+        assert_same(reference(code), FastCParser().parse(code))
+
+def test_example_programs():
+    for path in glob.glob(os.path.join(PROGRAMS, '*.c')):
+        with open(path) as f:
+            code = f.read()
+        try:
+            fast = FastCParser().parse(code)
+        except UnsupportedSyntax:
+            continue
+        assert_same(reference(code), fast)
+
+def test_unsupported_falls_back():
+    for code in UNSUPPORTED:
+        try:
+            FastCParser().parse(code)
+        except UnsupportedSyntax:
+            continue
+        raise AssertionError(f'fast parser accepted {code!r}')
+    ast = parse_source(UNSUPPORTED[3], 'c')
+    assert_same(reference(UNSUPPORTED[3]), ast)
+
+def test_compare_parsers():
+    data = compare_parsers({'ok': SUPPORTED[0], 'struct': UNSUPPORTED[0]}, repeat=1)
+    assert data['fallback_rate'] == 0.5
+    assert data['mismatches'] == []
+    assert data['results'][0]['speedup'] > 0
+
+def run_all():
+    test_matches_pycparser()
+    test_example_programs()
+    test_unsupported_falls_back()
+    test_compare_parsers()
+    print('All fast C parser tests passed!')
+
+if __name__ == "__main__":
+    run_all()
@@ -0,0 +1,61 @@
+import sys, os, tempfile
+import pytest
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from converter.ast_nodes import Program, VarDecl, Function, Print, Return, Array, ArrayAccess, If
+from converter.ir_format import dumps_ir, loads_ir, dump_ir, load_ir, LazyStatements
+from converter.python_generator import generate_python
+from converter.c_generator import generate_c
+from converter.pipeline import parse_source
+
+C_CODE = '''
+int square(int x) {
+    return x * x;
+}
+int main() {
+    int values[3];
+    values[0] = square(4);
+    if (values[0] > 10) {
+        printf("%d", values[0]);
+    }
+    return 0;
+}
+'''
+
+def test_round_trip_matches_both_backends():
+    ast = parse_source(C_CODE, 'c')
+    loaded = loads_ir(dumps_ir(ast, 'c'))
+    assert isinstance(loaded.statements, LazyStatements)
+    assert generate_python(loaded) == generate_python(ast)
+    assert generate_c(loaded) == generate_c(ast)
+
+def test_scalar_values():
+    ast = Program([
+        VarDecl('int', 'big', 2 ** 40),
+        VarDecl('double', 'f', 1.25),
+        VarDecl('int', 'flag', True),
+        VarDecl('int', 'neg', -3),
+        Array('arr', 2, 'int', [1, 'x']),
+        Function('f', [('int', 'a')], 'int', [If('a', [Print(ArrayAccess('arr', 0))]), Return()]),
+    ])
+    loaded = loads_ir(dumps_ir(ast))
+    big, f, flag, neg, arr, func = loaded.statements
+    assert big.value == 2 ** 40 and f.value == 1.25 and flag.value is True and neg.value == -3
+    assert arr.values == [1, 'x']
+    assert func.params == [('int', 'a')]
+    assert func.body[0].then_body[0].value.index == 0
+    assert func.body[1].value is None
+
+def test_file_round_trip_records_language():
+    ast = parse_source('x = 5\nprint(x)\n', 'python')
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'prog.ir')
+        dump_ir(ast, path, 'python')
+        loaded, lang = load_ir(path)
+        assert lang == 'python'
+        assert generate_c(loaded) == generate_c(ast)
+
+def test_rejects_bad_input():
+    with pytest.raises(ValueError):
+        loads_ir(b'not an ir file at all, really not')
+    with pytest.raises(TypeError):
+        dumps_ir(Program([VarDecl('int', 'x', object())]))
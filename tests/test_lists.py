@@ -0,0 +1,157 @@
+import sys, os, subprocess, tempfile
+import pytest
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from parser.python_parser import PythonParser
+from converter.ast_nodes import (Assignment, BinaryOp, Function, List, ListAccess, ListAppend,
+                                 ListAssign, ListLength, VarDecl)
+from converter.c_generator import generate_c
+from converter.python_generator import generate_python
+from converter.parallel import generate_parallel
+from converter.pipeline import verify_roundtrip
+from benchmarks.differential import find_compiler
+
+PY_CODE = '''
+def build(n):
+    xs = []
+    i = 0
+    while i < n:
+        xs.append(i % 7)
+        i = i + 1
+    total = 0
+    j = 0
+    while j < len(xs):
+        total = total + xs[j]
+        j = j + 1
+    ys = [10, 20, 30]
+    ys[0] = ys[-1] + xs[3]
+    return total % 200 + ys[0]
+
+def main():
+    return build(300000)
+'''
+
+def test_python_lists_become_list_nodes():
+    program = PythonParser().parse(PY_CODE)
+    build = program.statements[0]
+    assert isinstance(build, Function)
+    xs, i, loop = build.body[:3]
+    assert isinstance(xs, List) and xs.values == [] and xs.element_type == 'int'
+    assert isinstance(i, VarDecl)
+    append, step = loop.body
+    assert isinstance(append, ListAppend) and append.list_name == 'xs'
+    assert isinstance(step, Assignment)  # rebinding, not a second declaration
+    condition = build.body[5].condition
+    assert isinstance(condition, BinaryOp) and isinstance(condition.right, ListLength)
+    assert isinstance(build.body[6], List) and build.body[6].values == [10, 20, 30]
+    assert isinstance(build.body[7].var_name, ListAccess)
+
+def test_element_type_inference():
+    program = PythonParser().parse('xs = [1.5, 2]\nys = []\nys.append(0.5)\nzs = [1]\n')
+    assert [s.element_type for s in program.statements if isinstance(s, List)] == ['double', 'double', 'int']
+
+PRINT_CODE = '''
+def main():
+    xs = [1, 2]
+    xs = [3, 4, 5]
+    names = []
+    names.append("a")
+    print(xs)
+    print(names)
+    xs = []
+    print(xs)
+    return 0
+'''
+
+def test_rebinding_a_list():
+    main = PythonParser().parse(PRINT_CODE).statements[0]
+    assert isinstance(main.body[0], List)
+    assert isinstance(main.body[1], ListAssign) and main.body[1].values == [3, 4, 5]
+    code = generate_c(PythonParser().parse(PRINT_CODE))
+    assert code.count('cc_list_int xs') == 1
+    assert 'cc_list_clear(xs);\n    cc_list_extend(xs, ((int[]){3, 4, 5}), 3);' in code
+    assert 'cc_list_print(xs, "%d");' in code and 'cc_list_print(names, "\'%s\'");' in code
+    assert generate_python(PythonParser().parse(PRINT_CODE)).count('xs = [') == 3
+
+def test_generated_c_uses_runtime_once():
+    program = PythonParser().parse(PY_CODE)
+    code = generate_c(program)
+    assert code.count('static inline void *cc_list_grow_') == 1
+    assert 'CC_LIST_TYPE(cc_list_int, int);' in code
+    assert 'cc_list_extend(ys, ((int[]){10, 20, 30}), 3);' in code
+    assert 'while (j < cc_list_len(xs))' in code
+    assert generate_parallel(program, 'c', workers=2, chunk_size=1) == code
+    assert 'cc_list' not in generate_c(PythonParser().parse('x = 1\n'))
+
+def test_python_roundtrip_keeps_lists():
+    program = PythonParser().parse(PY_CODE)
+    assert verify_roundtrip(program, generate_python(program), 'python') == []
+    assert 'does not parse' not in ' '.join(verify_roundtrip(program, generate_c(program), 'c'))
+
+def _compile_and_run(code, *flags):
+    with tempfile.TemporaryDirectory() as tmp:
+        source, binary = os.path.join(tmp, 'prog.c'), os.path.join(tmp, 'prog')
+        with open(source, 'w') as f:
+            f.write(code)
+        subprocess.run([find_compiler(), '-std=c99', '-Wall', '-Werror', *flags, source, '-o', binary], check=True)
+        return subprocess.run([binary], capture_output=True, text=True, timeout=30)
+
+@pytest.mark.skipif(find_compiler() is None, reason="no C compiler available")
+def test_compiled_lists_match_python():
+    namespace = {}
+    exec(PY_CODE, namespace)
+    expected = namespace['main']()
+    code = generate_c(PythonParser().parse(PY_CODE))
+    assert _compile_and_run(code).returncode == expected
+    assert _compile_and_run(code, '-O2', '-DNDEBUG').returncode == expected
+
+@pytest.mark.skipif(find_compiler() is None, reason="no C compiler available")
+def test_printed_lists_match_python():
+    from contextlib import redirect_stdout
+    from io import StringIO
+    namespace, expected = {}, StringIO()
+    exec(PRINT_CODE, namespace)
+    with redirect_stdout(expected):
+        namespace['main']()
+    # No indexing, so the unused index helper must not trip -Wall -Werror
+    result = _compile_and_run(generate_c(PythonParser().parse(PRINT_CODE)))
+    assert result.stdout == expected.getvalue()
+
+@pytest.mark.skipif(find_compiler() is None, reason="no C compiler available")
+def test_append_reading_the_same_list():
+    code = '''
+def main():
+    fib = [0, 1]
+    while len(fib) < 20:
+        fib.append(fib[-1] + fib[-2])
+    xs = []
+    while len(xs) < 5:
+        xs.append(len(xs))
+    return fib[-1] % 256 + xs[4]
+'''
+    namespace = {}
+    exec(code, namespace)
+    result = _compile_and_run(generate_c(PythonParser().parse(code)), '-Wsequence-point')
+    assert result.returncode == namespace['main']()
+
+@pytest.mark.skipif(find_compiler() is None, reason="no C compiler available")
+def test_out_of_range_index_aborts_in_debug_builds():
+    code = generate_c(PythonParser().parse('def main():\n    xs = [1, 2]\n    return xs[2]\n'))
+    result = _compile_and_run(code)
+    assert result.returncode != 0
+    assert 'list index out of range' in result.stderr
+
+def run_all():
+    test_python_lists_become_list_nodes()
+    test_element_type_inference()
+    test_rebinding_a_list()
+    test_generated_c_uses_runtime_once()
+    test_python_roundtrip_keeps_lists()
+    if find_compiler():
+        test_compiled_lists_match_python()
+        test_printed_lists_match_python()
+        test_append_reading_the_same_list()
+        test_out_of_range_index_aborts_in_debug_builds()
+    print('All list tests passed!')
+
+if __name__ == "__main__":
+    run_all()
@@ -0,0 +1,32 @@
+import sys, os, multiprocessing
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from benchmarks.corpus import CorpusConfig, generate_source
+from parser.c_parser import CParser
+from converter.ast_transformer import ASTTransformer
+from converter.python_generator import generate_python
+from converter.c_generator import generate_c
+from converter import parallel
+from converter.parallel import transform_parallel, generate_parallel
+
+C_CODE = generate_source('c', CorpusConfig(function_count=12, nesting_depth=3))
+
+def _check_matches_serial():
+    c_ast = CParser().parse(C_CODE)
+    serial = ASTTransformer().transform(c_ast)
+    parallel_ast = transform_parallel(c_ast, workers=2, chunk_size=5)
+    assert len(parallel_ast.statements) == len(serial.statements) == 13
+    assert generate_python(parallel_ast) == generate_python(serial)
+    assert generate_parallel(serial, 'python', workers=2, chunk_size=3) == generate_python(serial)
+    assert generate_parallel(serial, 'c', workers=3, chunk_size=1) == generate_c(serial)
+
+def test_parallel_matches_serial():
+    _check_matches_serial()
+
+def test_parallel_without_fork(monkeypatch):
+    # Platforms without fork ship each chunk to the workers instead
+    monkeypatch.setattr(parallel, '_pool_context', lambda: (multiprocessing.get_context('spawn'), False))
+    _check_matches_serial()
+
+def test_single_worker_is_serial():
+    c_ast = CParser().parse(C_CODE)
+    assert generate_python(transform_parallel(c_ast, workers=1)) == generate_python(ASTTransformer().transform(c_ast))
@@ -0,0 +1,63 @@
+import sys, os, json
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from converter.ast_nodes import Program, VarDecl, Print, While, Assignment
+from converter.profiling import Profiler, count_nodes
+from converter.pipeline import parse_source, generate_output
+
+C_CODE = '''
+int main() {
+    int i = 0;
+    while (i < 3) {
+        printf("%d", i);
+        i = i + 1;
+    }
+}
+'''
+
+def test_count_nodes():
+    program = Program([VarDecl('int', 'i', '0'), While('i < 3', [Print('i'), Assignment('i', 'i + 1')])])
+    counts = count_nodes(program)
+    assert counts == {'Program': 1, 'VarDecl': 1, 'While': 1, 'Print': 1, 'Assignment': 1}
+
+def test_pipeline_stages():
+    profiler = Profiler()
+    ast = parse_source(C_CODE, 'c', profiler, c_parser='pycparser')
+    generate_output(ast, 'python', profiler)
+    names = [stage.name for stage in profiler.stages]
+    assert names == ['parse', 'transform', 'generate']
+    parse_stage, transform_stage, _ = profiler.stages
+    assert parse_stage.node_counts['FileAST'] == 1
+    assert transform_stage.node_counts['While'] == 1
+    assert all(stage.wall_time >= 0 and stage.peak_memory >= 0 for stage in profiler.stages)
+
+def test_fast_parser_stages():
+    profiler = Profiler()
+    parse_source(C_CODE, 'c', profiler)
+    assert [stage.name for stage in profiler.stages] == ['fast_parse']
+    assert profiler.stages[0].node_counts['While'] == 1
+
+    profiler = Profiler()
+    parse_source('struct s { int a; };', 'c', profiler)  # outside the subset
+    assert [stage.name for stage in profiler.stages] == ['fast_parse', 'parse', 'transform']
+
+def test_hooks_and_json_report():
+    seen = []
+    profiler = Profiler()
+    profiler.add_hook(lambda stage: seen.append(stage.name))
+    ast = parse_source('x = 1\nprint(x)\n', 'python', profiler)
+    generate_output(ast, 'c', profiler)
+    assert seen == ['parse', 'generate']
+    report = json.loads(profiler.report('json'))
+    assert [s['stage'] for s in report['stages']] == ['parse', 'generate']
+    assert report['stages'][0]['node_counts']['Print'] == 1
+    assert 'parse' in profiler.report('text')
+
+def run_all():
+    test_count_nodes()
+    test_pipeline_stages()
+    test_fast_parser_stages()
+    test_hooks_and_json_report()
+    print('All profiling tests passed!')
+
+if __name__ == "__main__":
+    run_all()
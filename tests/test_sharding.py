@@ -0,0 +1,98 @@
+import sys, os, json, subprocess
+import pytest
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from converter.sharding import parse_shard, read_manifest, plan_shards, run_shard, merge_shards
+from benchmarks.corpus import CorpusConfig, generate_source
+
+MAIN = os.path.join(os.path.dirname(__file__), '..', 'main.py')
+
+def test_parse_shard():
+    assert parse_shard('2/4') == (2, 4)
+    for bad in ('0/4', '5/4', '2', 'a/b'):
+        with pytest.raises(ValueError):
+            parse_shard(bad)
+
+def test_plan_is_balanced_and_order_independent():
+    entries = [(f'f{i}.c', f'{i:064x}', size) for i, size in enumerate([900, 500, 400, 300, 300, 200, 100, 100])]
+    plan = plan_shards(entries, 3)
+    assert sorted(name for names in plan for name in names) == sorted(e[0] for e in entries)
+    sizes = {name: size for name, _, size in entries}
+    loads = [sum(sizes[name] for name in names) for names in plan]
+    assert max(loads) - min(loads) <= 200
+    assert plan_shards(list(reversed(entries)), 3) == plan
+
+def test_read_manifest_rejects_escaping_paths(tmp_path):
+    manifest = tmp_path / 'inputs.txt'
+    manifest.write_text('# comment\n\na.c\nsub/b.py\n')
+    assert read_manifest(str(manifest)) == ['a.c', os.path.join('sub', 'b.py')]
+    manifest.write_text('../a.c\n')
+    with pytest.raises(ValueError):
+        read_manifest(str(manifest))
+
+def _make_inputs(root):
+    names = []
+    for i in range(7):
+        config = CorpusConfig(function_count=1 + i, seed=i)
+        name = os.path.join('src', f'unit{i}.c')
+        (root / 'src').mkdir(exist_ok=True)
+        (root / name).write_text(generate_source('c', config))
+        names.append(name)
+    (root / 'src' / 'script.py').write_text('x = 1\nprint(x)\n')
+    names.append(os.path.join('src', 'script.py'))
+    manifest = root / 'inputs.txt'
+    manifest.write_text('\n'.join(names) + '\n')
+    return str(manifest), names
+
+def test_shards_as_separate_processes(tmp_path):
+    manifest, names = _make_inputs(tmp_path)
+    shards = [subprocess.Popen([sys.executable, MAIN, manifest, '--shard', f'{k}/3',
+                                '--output', str(tmp_path / f'host{k}')], stdout=subprocess.DEVNULL)
+              for k in (1, 2, 3)]
+    assert [proc.wait() for proc in shards] == [0, 0, 0]
+    results = [str(tmp_path / f'host{k}' / f'shard-{k}-of-3.json') for k in (1, 2, 3)]
+    converted = [r['input'] for path in results for r in json.load(open(path))['results']]
+    assert sorted(converted) == sorted(names)
+
+    final = tmp_path / 'final'
+    merged = subprocess.run([sys.executable, MAIN, manifest, '--merge', *results, '--output', str(final)],
+                            capture_output=True, text=True)
+    assert merged.returncode == 0, merged.stdout
+    assert (final / 'src' / 'unit3.py').exists() and (final / 'src' / 'script.c').exists()
+    assert len(json.load(open(final / 'manifest.json'))['results']) == len(names)
+
+    assert any('missing shard' in p for p in merge_shards(manifest, results[:2], str(tmp_path / 'partial')))
+    (tmp_path / 'garbage.json').write_text('{not json')
+    problems = merge_shards(manifest, results[:2] + [str(tmp_path / 'garbage.json')], str(tmp_path / 'bad'))
+    assert any('cannot read' in p for p in problems) and any('missing shard' in p for p in problems)
+    unreadable = subprocess.run([sys.executable, MAIN, manifest, '--merge', str(tmp_path / 'nope.json'),
+                                 '--output', str(tmp_path / 'none')], capture_output=True, text=True)
+    assert unreadable.returncode == 1 and 'MERGE ERROR' in unreadable.stdout
+    assert any('more than once' in p for p in merge_shards(manifest, results + results[:1], str(tmp_path / 'dup')))
+    for path in (tmp_path / 'host2' / 'src').iterdir():
+        path.write_text('tampered')
+    assert any('modified' in p for p in merge_shards(manifest, results, str(tmp_path / 'tampered')))
+    (tmp_path / 'src' / 'unit0.c').write_text('int main() { return 0; }')
+    assert any('different manifest' in p for p in merge_shards(manifest, results, str(tmp_path / 'stale')))
+
+def test_shard_refuses_to_overwrite_inputs(tmp_path):
+    manifest, _ = _make_inputs(tmp_path)
+    original = (tmp_path / 'src' / 'unit0.c').read_text()
+    with pytest.raises(ValueError):
+        run_shard(manifest, 1, 2, str(tmp_path), ['c'])
+    proc = subprocess.run([sys.executable, MAIN, manifest, '--shard', '2/2', '--target', 'c',
+                           '--output', str(tmp_path)], capture_output=True, text=True)
+    assert proc.returncode == 2 and 'overwrite' in proc.stderr
+    assert (tmp_path / 'src' / 'unit0.c').read_text() == original
+
+def run_all():
+    import tempfile, pathlib
+    test_parse_shard()
+    test_plan_is_balanced_and_order_independent()
+    for test in (test_read_manifest_rejects_escaping_paths, test_shards_as_separate_processes,
+                 test_shard_refuses_to_overwrite_inputs):
+        with tempfile.TemporaryDirectory() as tmp:
+            test(pathlib.Path(tmp))
+    print('All sharding tests passed!')
+
+if __name__ == "__main__":
+    run_all()
@@ -0,0 +1,101 @@
+import sys, os
+import pytest
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from converter import watch
+from converter.watch import (InotifyWatcher, PollingWatcher, WatchSession, collect_changes,
+                             open_watcher)
+
+def _write(path, text):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w') as f:
+        f.write(text)
+
+def _bump(path, text):
+    # Make sure the mtime moves even on filesystems with coarse timestamps
+    _write(path, text)
+    stamp = os.stat(path).st_mtime_ns + 10_000_000
+    os.utime(path, ns=(stamp, stamp))
+
+def _watchers(root):
+    yield PollingWatcher([root], interval=0.01)
+    if watch._libc() is not None:
+        yield InotifyWatcher([root])
+
+def test_watchers_report_changed_files(tmp_path):
+    src = str(tmp_path / 'src')
+    _write(os.path.join(src, 'a.c'), 'int main() { return 0; }')
+    _write(os.path.join(src, 'notes.txt'), 'ignored')
+    for watcher in _watchers(src):
+        try:
+            assert watcher.poll(0.05) == set()
+            _bump(os.path.join(src, 'a.c'), 'int main() { return 1; }')
+            _bump(os.path.join(src, 'notes.txt'), 'still ignored')
+            assert watcher.poll(1) == {os.path.join(src, 'a.c')}
+            _write(os.path.join(src, 'pkg', 'b.py'), 'x = 1\n')  # new directory and file
+            changed = collect_changes(watcher, 1, debounce=0.05)
+            assert os.path.join(src, 'pkg', 'b.py') in changed
+        finally:
+            watcher.close()
+
+def test_collect_changes_coalesces_bursts():
+    class Burst:
+        def __init__(self):
+            self.rounds = [{'a.c'}, {'a.c', 'b.c'}, {'c.c'}, set()]
+        def poll(self, timeout):
+            return self.rounds.pop(0) if self.rounds else set()
+    assert collect_changes(Burst(), 1) == {'a.c', 'b.c', 'c.c'}
+
+def test_open_watcher_falls_back_to_polling(tmp_path, monkeypatch):
+    monkeypatch.setattr(watch, '_libc', lambda: None)
+    watcher = open_watcher([str(tmp_path)])
+    assert isinstance(watcher, PollingWatcher)
+
+def test_session_converts_only_changed_files(tmp_path):
+    src, out = str(tmp_path / 'src'), str(tmp_path / 'out')
+    _write(os.path.join(src, 'a.c'), 'int main() { int x = 1; return x; }')
+    _write(os.path.join(src, 'lib', 'b.py'), 'y = 2\n')
+    logs = []
+    session = WatchSession(src, out, polling=True, interval=0.01, debounce=0.02, log=logs.append)
+    try:
+        assert len(session.convert_stale()) == 2
+        assert session.convert_stale() == []  # outputs are up to date
+        with open(os.path.join(out, 'lib', 'b.c')) as f:
+            assert 'int y = 2;' in f.read()
+
+        _bump(os.path.join(src, 'a.c'), 'int main() { int x = 7; return x; }')
+        results = session.step(timeout=1)
+        assert [r['source'] for r in results] == [os.path.join(src, 'a.c')]
+        assert results[0]['latency'] >= 0
+        with open(os.path.join(out, 'a.py')) as f:
+            assert 'x = 7' in f.read()
+
+        _bump(os.path.join(src, 'a.c'), 'int main( {')  # a broken save is reported, not fatal
+        results = session.step(timeout=1)
+        assert results[0]['error']
+        assert '1 conversion(s)' in session.summary()
+    finally:
+        session.close()
+
+def test_session_rejects_output_inside_watched_directory(tmp_path):
+    with pytest.raises(ValueError):
+        WatchSession(str(tmp_path), str(tmp_path / 'out'))
+
+def test_session_rejects_output_that_is_the_input(tmp_path):
+    _write(str(tmp_path / 'w.c'), 'int main() { return 0; }\n')
+    with pytest.raises(ValueError):
+        WatchSession(str(tmp_path / 'w.c'), str(tmp_path / 'w.c'), ['c'])
+    with pytest.raises(ValueError):
+        WatchSession(str(tmp_path / 'w.c'), str(tmp_path / 'w.py'), ['python', 'c'])
+
+def run_all():
+    import tempfile, pathlib
+    for test in (test_watchers_report_changed_files, test_session_converts_only_changed_files,
+                 test_session_rejects_output_inside_watched_directory,
+                 test_session_rejects_output_that_is_the_input):
+        with tempfile.TemporaryDirectory() as tmp:
+            test(pathlib.Path(tmp))
+    test_collect_changes_coalesces_bursts()
+    print('All watch tests passed!')
+
+if __name__ == "__main__":
+    run_all()